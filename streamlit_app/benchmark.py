@@ -0,0 +1,178 @@
+"""Measure crawler throughput against a local synthetic site
+
+Serves a generated site from a local HTTP server (in its own process)
+and crawls it with WebCrawler, reporting pages/sec, CPU time and peak
+memory for each site size:
+
+    python benchmark.py --pages 1000 10000 100000 --latency 0.005 --error-rate 0.01
+
+With --workers, the crawl is split over that many worker processes
+sharing a SQLite frontier (see utils.distributed).
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from collections import Counter
+import logging
+
+from utils.crawler import WebCrawler
+from utils.distributed import DistributedCrawler
+from utils.sinks import JSONLSink
+from utils.synthetic_site import SyntheticSiteServer
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+def _child_cpu_seconds():
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+def run_crawl(url, num_pages, options, results):
+    """Crawl the site in a fresh process so peak memory belongs to this run only"""
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as directory:
+        crawler_options = {
+            'respect_robots': True,
+            'delay': 0,
+            'max_pages': num_pages,
+            'max_depth': options['max_depth'],
+            'concurrency': options['concurrency'],
+            'per_host_concurrency': options['concurrency'],
+            'max_retries': options['retries'],
+            'parser': options['parser'],
+            'parse_workers': options['parse_workers'],
+            'links_only': options['links_only']
+        }
+        if options['workers'] > 1:
+            crawler = DistributedCrawler(workers=options['workers'], work_dir=directory, **crawler_options)
+        else:
+            crawler = WebCrawler(sink=JSONLSink(os.path.join(directory, 'pages.jsonl')), keep_pages=False,
+                                 **crawler_options)
+
+        cpu_started = time.process_time()
+        children_started = _child_cpu_seconds()
+        started = time.perf_counter()
+        crawl_results = crawler.crawl(url)
+        seconds = time.perf_counter() - started
+
+        # Parser and worker processes have been joined by now, so their CPU time is counted
+        cpu_seconds = time.process_time() - cpu_started
+        cpu_seconds += _child_cpu_seconds() - children_started
+        if options['workers'] > 1:
+            # Add up the workers' metrics
+            statuses = Counter()
+            metrics = {'bytes': 0, 'stages': {}}
+            for result in crawler.worker_results:
+                statuses.update(result['metrics']['statuses'])
+                metrics['bytes'] += result['metrics']['bytes']
+                for stage, values in result['metrics']['stages'].items():
+                    total = metrics['stages'].setdefault(stage, {'total_seconds': 0.0})
+                    total['total_seconds'] += values['total_seconds']
+            metrics['statuses'] = dict(statuses)
+        else:
+            metrics = crawler.metrics.to_dict()
+
+    peak_rss_mb = None
+    if resource is not None:
+        # ru_maxrss is in kilobytes on Linux; with workers, count the largest process
+        peak_rss_mb = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                          resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) / 1024
+
+    results.put({
+        'site_pages': num_pages,
+        'workers': options['workers'],
+        'pages': crawl_results['pages_indexed'],
+        'skipped': crawl_results['pages_skipped'],
+        'seconds': round(seconds, 2),
+        'pages_per_second': round(crawl_results['pages_indexed'] / seconds, 1) if seconds else 0,
+        'cpu_seconds': round(cpu_seconds, 2),
+        'cpu_percent': round(100 * cpu_seconds / seconds, 1) if seconds else 0,
+        'peak_rss_mb': round(peak_rss_mb, 1) if peak_rss_mb is not None else None,
+        'megabytes': round(metrics['bytes'] / 1e6, 1),
+        'statuses': metrics['statuses'],
+        'stage_seconds': {stage: round(values['total_seconds'], 2) for stage, values in metrics['stages'].items()}
+    })
+
+def benchmark(sizes, latency=0.0, jitter=0.0, error_rate=0.0, html_size=30000, avg_links=20,
+              concurrency=16, parse_workers=0, parser='auto', retries=0, max_depth=10, workers=1,
+              links_only=False):
+    """Crawl a synthetic site of each size and return one result dict per size"""
+    options = {
+        'concurrency': concurrency,
+        'parse_workers': parse_workers,
+        'parser': parser,
+        'retries': retries,
+        'max_depth': max_depth,
+        'workers': workers,
+        'links_only': links_only
+    }
+    results = []
+
+    for num_pages in sizes:
+        with SyntheticSiteServer(num_pages, latency=latency, jitter=jitter, error_rate=error_rate,
+                                 html_size=html_size, avg_links=avg_links) as server:
+            queue = multiprocessing.Queue()
+            process = multiprocessing.Process(target=run_crawl, args=(server.url, num_pages, options, queue))
+            process.start()
+            result = queue.get()
+            process.join()
+
+        results.append(result)
+        print_result(result)
+
+    return results
+
+def print_result(result):
+    print(
+        f"{result['site_pages']:>8} pages: {result['pages']:>8} crawled in {result['seconds']:>8.2f}s "
+        f"| {result['pages_per_second']:>7.1f} pages/s | CPU {result['cpu_seconds']:>8.2f}s ({result['cpu_percent']:.0f}%) "
+        f"| peak RSS {result['peak_rss_mb']} MB | {result['megabytes']} MB downloaded | HTTP {result['statuses']}",
+        flush=True
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--pages', type=int, nargs='+', default=[1000, 10000, 100000], help="site sizes to crawl")
+    parser.add_argument('--latency', type=float, default=0.0, help="server latency per request in seconds")
+    parser.add_argument('--jitter', type=float, default=0.0, help="extra random latency of up to this many seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of requests answered with HTTP 503")
+    parser.add_argument('--html-size', type=int, default=30000, help="approximate HTML bytes per page")
+    parser.add_argument('--avg-links', type=int, default=20, help="average power-law links per page, besides the tree links")
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--parse-workers', type=int, default=0, help="parser processes (0 parses in the fetch threads)")
+    parser.add_argument('--workers', type=int, default=1, help="crawl worker processes sharing one frontier")
+    parser.add_argument('--parser', default='auto', help="HTML parser backend")
+    parser.add_argument('--retries', type=int, default=0)
+    parser.add_argument('--links-only', action='store_true', help="only parse links, title and canonical")
+    parser.add_argument('--json', help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = benchmark(
+        args.pages,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        html_size=args.html_size,
+        avg_links=args.avg_links,
+        concurrency=args.concurrency,
+        parse_workers=args.parse_workers,
+        parser=args.parser,
+        retries=args.retries,
+        workers=args.workers,
+        links_only=args.links_only
+    )
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -11,6 +11,7 @@ import re
 # Add the parent directory to the path to import utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.crawler import WebCrawler
+from utils.scope import ScopeRules
 from utils.analyzer import ContentAnalyzer
 from utils.suggestion_engine import SuggestionEngine
 
@@ -149,21 +150,56 @@ with tab1:
 
     with col3:
         respect_robots = st.checkbox("Respect robots.txt", value=True)
+        use_sitemaps = st.checkbox("Seed from sitemaps", value=True)
+        concurrency = st.number_input("Concurrent Requests", min_value=1, max_value=32, value=4, step=1)
+        auto_throttle = st.checkbox("Auto-throttle", value=False, help="Adapt the delay and per-host concurrency to each server's response times and errors")
+        avoid_traps = st.checkbox("Avoid crawler traps", value=True, help="Skip session-ID URLs, endlessly repeating paths, very long URLs and explosions of filter/query combinations")
 
     with col4:
         crawl_delay = st.slider("Crawl Delay (seconds)", min_value=0.1, max_value=5.0, value=1.0, step=0.1)
+        per_host_concurrency = st.number_input("Concurrent Requests per Host", min_value=1, max_value=16, value=2, step=1)
+        crawl_order = st.selectbox("Crawl Order", ["Breadth-first", "Most linked first"], help="With a page limit, 'Most linked first' spends it on the pages that collect the most internal links")
+        if auto_throttle:
+            max_delay = st.slider("Maximum Auto-throttle Delay (seconds)", min_value=1.0, max_value=60.0, value=10.0, step=1.0)
+        else:
+            max_delay = 60.0
+
+    exclude_patterns = st.text_area(
+        "Exclude URL Patterns",
+        placeholder="/cart/*\n/search*\nre:/tag/[^/]+/page/",
+        help="One pattern per line, matched against the path and query. '*' matches anything; prefix a regular expression with 're:'"
+    )
+    exclude_patterns = [line.strip() for line in exclude_patterns.splitlines() if line.strip()]
+    scope = None
+    is_valid_scope = True
+    try:
+        if avoid_traps:
+            scope = ScopeRules(exclude=exclude_patterns)
+        elif exclude_patterns:
+            scope = ScopeRules(exclude=exclude_patterns, max_url_length=None, max_query_params=None,
+                               max_segment_repeats=None, max_query_variants=None, session_params=())
+    except ValueError as e:
+        is_valid_scope = False
+        st.error(str(e))
 
     # Crawl button
     crawl_col1, crawl_col2, crawl_col3 = st.columns([1, 1, 1])
 
     with crawl_col2:
-        if st.button("Start Crawl", disabled=not is_valid_url, use_container_width=True):
+        if st.button("Start Crawl", disabled=not (is_valid_url and is_valid_scope), use_container_width=True):
             # Initialize crawler
             st.session_state.crawler = WebCrawler(
                 respect_robots=respect_robots,
                 delay=crawl_delay,
                 max_pages=max_pages,
-                max_depth=max_depth
+                max_depth=max_depth,
+                concurrency=concurrency,
+                per_host_concurrency=per_host_concurrency,
+                use_sitemaps=use_sitemaps,
+                auto_throttle=auto_throttle,
+                max_delay=max_delay,
+                scheduling='opic' if crawl_order == "Most linked first" else 'fifo',
+                scope=scope
             )
 
             # Show progress
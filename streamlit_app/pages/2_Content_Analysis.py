@@ -13,6 +13,7 @@ import networkx as nx
 # Add the parent directory to the path to import utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.analyzer import ContentAnalyzer
+from utils.link_graph import link_counts
 
 # Set page configuration
 st.set_page_config(
@@ -169,8 +170,8 @@ else:
                 'Metric': ['Crawl Depth', 'Incoming Links', 'Outgoing Links', 'Content Length'],
                 'Value': [
                     page_data['depth'],
-                    len(incoming_links),
-                    len(outgoing_links),
+                    int(link_counts(incoming_links).sum()),
+                    int(link_counts(outgoing_links).sum()),
                     len(page_data['content'])
                 ]
             })
@@ -96,7 +96,12 @@ if 'settings' not in st.session_state:
             'max_pages': 50,
             'max_depth': 3,
             'respect_robots': True,
-            'crawl_delay': 1.0
+            'crawl_delay': 1.0,
+            'concurrency': 4,
+            'per_host_concurrency': 2,
+            'use_sitemaps': True,
+            'auto_throttle': False,
+            'max_delay': 10.0
         },
         'analysis': {
             'min_incoming_links': 3,
@@ -161,6 +166,11 @@ with tab1:
         value=st.session_state.settings['crawl']['respect_robots']
     )
 
+    use_sitemaps = st.checkbox(
+        "Seed from sitemaps",
+        value=st.session_state.settings['crawl'].get('use_sitemaps', True)
+    )
+
     crawl_delay = st.slider(
         "Crawl Delay (seconds)",
         min_value=0.1,
@@ -169,11 +179,47 @@ with tab1:
         step=0.1
     )
 
+    concurrency = st.slider(
+        "Concurrent Requests",
+        min_value=1,
+        max_value=32,
+        value=st.session_state.settings['crawl'].get('concurrency', 4),
+        step=1
+    )
+
+    per_host_concurrency = st.slider(
+        "Concurrent Requests per Host",
+        min_value=1,
+        max_value=16,
+        value=st.session_state.settings['crawl'].get('per_host_concurrency', 2),
+        step=1
+    )
+
+    auto_throttle = st.checkbox(
+        "Auto-throttle",
+        value=st.session_state.settings['crawl'].get('auto_throttle', False),
+        help="Adapt the delay and per-host concurrency to each server's response times and errors, starting from the crawl delay"
+    )
+
+    max_delay = st.slider(
+        "Maximum Auto-throttle Delay (seconds)",
+        min_value=1.0,
+        max_value=60.0,
+        value=st.session_state.settings['crawl'].get('max_delay', 10.0),
+        step=1.0,
+        disabled=not auto_throttle
+    )
+
     # Update settings
     st.session_state.settings['crawl']['max_pages'] = max_pages
     st.session_state.settings['crawl']['max_depth'] = max_depth
     st.session_state.settings['crawl']['respect_robots'] = respect_robots
     st.session_state.settings['crawl']['crawl_delay'] = crawl_delay
+    st.session_state.settings['crawl']['concurrency'] = concurrency
+    st.session_state.settings['crawl']['per_host_concurrency'] = per_host_concurrency
+    st.session_state.settings['crawl']['use_sitemaps'] = use_sitemaps
+    st.session_state.settings['crawl']['auto_throttle'] = auto_throttle
+    st.session_state.settings['crawl']['max_delay'] = max_delay
 
     st.markdown('</div>', unsafe_allow_html=True)
     st.markdown('</div>', unsafe_allow_html=True)
@@ -275,7 +321,12 @@ with tab4:
                             'max_pages': 50,
                             'max_depth': 3,
                             'respect_robots': True,
-                            'crawl_delay': 1.0
+                            'crawl_delay': 1.0,
+                            'concurrency': 4,
+                            'per_host_concurrency': 2,
+                            'use_sitemaps': True,
+                            'auto_throttle': False,
+                            'max_delay': 10.0
                         },
                         'analysis': {
                             'min_incoming_links': 3,
@@ -0,0 +1,23 @@
+import os
+import sys
+import logging
+
+import pytest
+
+# Make the app's utils package importable, as the Streamlit pages do
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.synthetic_site import SyntheticSite, SyntheticSiteServer
+
+logging.disable(logging.WARNING)
+
+SITE_PAGES = 300
+
+@pytest.fixture(scope='session')
+def site():
+    return SyntheticSite(SITE_PAGES, html_size=2000)
+
+@pytest.fixture(scope='session')
+def site_server():
+    with SyntheticSiteServer(SITE_PAGES, html_size=2000) as server:
+        yield server
@@ -0,0 +1,20 @@
+import time
+
+from utils.crawler import WebCrawler
+from utils.synthetic_site import SyntheticSiteServer
+
+def test_urls_of_a_dead_host_are_skipped():
+    server = SyntheticSiteServer(300, html_size=2000).start()
+    crawler = WebCrawler(delay=0, max_pages=1000, max_depth=10, max_retries=0, concurrency=4, per_host_concurrency=4,
+                         failure_threshold=2, reset_timeout=0.1, max_circuit_trials=2)
+
+    started = time.monotonic()
+    for index, _ in enumerate(crawler.crawl_iter(server.url)):
+        if index == 20:
+            server.stop()
+
+    assert time.monotonic() - started < 30
+    reasons = {skip['reason'] for skip in crawler.skipped}
+    assert 'circuit_open' in reasons
+    assert crawler.pages_indexed + len(crawler.skipped) >= 21 + len(crawler.urls_to_visit)
+    assert not crawler.urls_to_visit
@@ -0,0 +1,42 @@
+import pytest
+import requests
+
+from utils.http_client import CircuitBreaker, HttpClient
+
+def test_breaker_blocks_until_cool_down():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure('a')
+    assert not breaker.blocked('a')
+
+    breaker.record_failure('a')
+    assert breaker.blocked('a')
+    assert 59 < breaker.retry_in('a') <= 60
+    assert not breaker.allow('a')
+
+def test_failed_trial_does_not_block_host_for_good(monkeypatch):
+    client = HttpClient(max_retries=0, failure_threshold=1, reset_timeout=0)
+    client.breaker.record_failure('example.com')
+
+    def redirect_loop(method, url, **kwargs):
+        raise requests.TooManyRedirects("Exceeded 30 redirects")
+
+    monkeypatch.setattr(client.session, 'request', redirect_loop)
+    with pytest.raises(requests.TooManyRedirects):
+        client.get('http://example.com/')
+
+    # The trial ended without a verdict, so the next request is a new trial
+    assert not client.breaker.blocked('example.com')
+    assert client.breaker.allow('example.com')
+
+def test_breaker_gives_up_after_failed_trials():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0, max_trials=2)
+    breaker.record_failure('a')
+
+    for _ in range(2):
+        assert not breaker.given_up('a')
+        assert breaker.allow('a')
+        breaker.record_failure('a')
+
+    assert breaker.given_up('a')
+    assert breaker.blocked('a')
+    assert not breaker.allow('a')
@@ -0,0 +1,26 @@
+import pandas as pd
+
+from utils.link_graph import LinkGraph, PageList, link_counts
+
+def page(url, *links):
+    return {'url': url, 'title': url, 'links': [{'url': target, 'text': text, 'source_url': url} for target, text in links]}
+
+def test_repeated_links_keep_their_anchors():
+    graph = LinkGraph()
+    pages = PageList(graph)
+    for record in (page('/a', ('/b', 'Home'), ('/c', 'C'), ('/b', 'Back home'), ('/b', 'Home')),
+                   page('/b', ('/c', 'C'), ('/c', 'C'))):
+        graph.add_page(record)
+        pages.append(record)
+
+    assert len(graph) == 3
+    assert [(link['url'], link['text']) for link in pages[0]['links']] == [
+        ('/b', 'Home'), ('/b', 'Back home'), ('/b', 'Home'), ('/c', 'C')
+    ]
+    assert [link['text'] for link in pages[-1]['links']] == ['C', 'C']
+    assert [record['title'] for record in pages] == ['/a', '/b']
+    assert 'links' not in pages.records[0]
+
+    links_df = graph.to_df()
+    assert link_counts(links_df).sum() == graph.link_count() == 6
+    assert link_counts(pd.DataFrame({'target_url': ['/a', '/a']})).sum() == 2
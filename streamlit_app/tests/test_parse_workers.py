@@ -0,0 +1,18 @@
+from utils.crawler import WebCrawler
+
+def test_parse_workers_build_the_same_pages(site_server, tmp_path):
+    options = dict(delay=0, max_pages=1000, max_depth=10, concurrency=4, per_host_concurrency=4)
+    threads = WebCrawler(**options)
+    threads.crawl(site_server.url)
+    processes = WebCrawler(parse_workers=2, archive_path=str(tmp_path / 'site.warc.gz'), **options)
+    processes.crawl(site_server.url)
+
+    def summary(crawler):
+        return sorted((page['url'], page['title'], len(page['links'])) for page in crawler.iter_pages())
+
+    assert summary(processes) == summary(threads)
+
+    # Re-extraction parses in a process pool too
+    reextracted = WebCrawler()
+    reextracted.reextract(str(tmp_path / 'site.warc.gz'), workers=2)
+    assert summary(reextracted) == summary(threads)
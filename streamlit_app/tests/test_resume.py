@@ -0,0 +1,29 @@
+from utils.checkpoint import CrawlCheckpoint
+from utils.crawler import WebCrawler
+
+def test_resume_does_not_refetch_crawled_pages(site, site_server, tmp_path):
+    options = dict(delay=0, max_pages=1000, max_depth=10, concurrency=4, per_host_concurrency=4,
+                   checkpoint_path=str(tmp_path / 'crawl.db'), checkpoint_every=10)
+
+    first = WebCrawler(**options)
+    first_urls = set()
+    for page in first.crawl_iter(site_server.url):
+        first_urls.add(page['url'])
+        if len(first_urls) == 50:
+            break
+
+    resumed = WebCrawler(**options)
+    resumed_urls = {page['url'] for page in resumed.resume_iter()}
+
+    assert not first_urls & resumed_urls
+    assert len(first_urls | resumed_urls) == site.num_pages
+    assert resumed.pages_indexed == site.num_pages
+    # Pages fetched before the interruption are not requested again
+    assert resumed.metrics.statuses['200'] == len(resumed_urls)
+
+def test_checkpoint_saves_frontier_changes(tmp_path):
+    checkpoint = CrawlCheckpoint(str(tmp_path / 'crawl.db'))
+    checkpoint.save({}, [], ['a', 'b', 'c'], [('a', 2), ('b', 2), ('c', 3)], [])
+    checkpoint.save({}, [], [], [('c', 1), ('d', 1)], ['a'])
+
+    assert list(checkpoint.iter_frontier()) == [('b', 2), ('c', 1), ('d', 1)]
@@ -0,0 +1,51 @@
+import pytest
+
+from utils.crawler import WebCrawler
+
+def crawl(site_server, previous_pages=None):
+    crawler = WebCrawler(delay=0, max_pages=1000, max_depth=10, concurrency=4, per_host_concurrency=4)
+    crawler.crawl(site_server.url, previous_pages=previous_pages)
+    return crawler
+
+def test_unchanged_pages_are_reused(site_server):
+    first = crawl(site_server)
+    second = crawl(site_server, previous_pages=first.iter_pages())
+
+    assert second.pages_indexed == first.pages_indexed
+    assert second.metrics.to_dict()['statuses'] == {'304': first.pages_indexed}
+    assert len(second.get_links_df()) == len(first.get_links_df())
+    assert not second.skipped
+
+def test_crawler_pages_are_reused(site_server):
+    first = crawl(site_server)
+    second = crawl(site_server, previous_pages=first.pages)
+
+    assert second.pages_indexed == first.pages_indexed
+    assert second.metrics.to_dict()['statuses'] == {'304': first.pages_indexed}
+    assert not second.skipped
+
+def test_pages_without_links_are_fetched_in_full(site_server):
+    first = crawl(site_server)
+    previous = [{key: value for key, value in page.items() if key != 'links'} for page in first.pages]
+    second = crawl(site_server, previous_pages=previous)
+
+    assert second.metrics.to_dict()['statuses'] == {'200': first.pages_indexed}
+
+def test_saved_pages_are_reused(site_server, tmp_path):
+    first = crawl(site_server)
+    path = str(tmp_path / 'pages.jsonl')
+    first.save_pages(path)
+    second = crawl(site_server, previous_pages=path)
+
+    assert second.metrics.to_dict()['statuses'] == {'304': first.pages_indexed}
+
+def test_archive_is_not_emptied_by_an_incremental_crawl(site_server, tmp_path):
+    archive_path = str(tmp_path / 'site.warc.gz')
+    first = WebCrawler(delay=0, max_pages=20, archive_path=archive_path)
+    first.crawl(site_server.url)
+    second = WebCrawler(delay=0, max_pages=20, archive_path=archive_path)
+
+    with pytest.raises(ValueError):
+        second.crawl(site_server.url, previous_pages=first.iter_pages())
+
+    assert WebCrawler().reextract(archive_path)['pages_indexed'] == 20
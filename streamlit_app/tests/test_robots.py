@@ -0,0 +1,52 @@
+import os
+
+import requests
+
+from utils.robots import RobotsCache
+
+class FakeResponse:
+    def __init__(self, status_code, text=''):
+        self.status_code = status_code
+        self.text = text
+
+class FakeClient:
+    """Answers robots.txt requests from a list, raising exceptions in it"""
+
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.requests = 0
+
+    def get(self, url, **kwargs):
+        self.requests += 1
+        answer = self.answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+def test_server_error_disallows_without_caching(tmp_path):
+    cache_dir = str(tmp_path)
+    client = FakeClient(FakeResponse(503))
+    robots = RobotsCache(client, 'TestBot/1.0', cache_dir=cache_dir)
+
+    assert not robots.can_fetch('https://example.com/page/')
+    assert not os.listdir(cache_dir)
+
+    # The next crawl fetches robots.txt again instead of allowing everything
+    robots = RobotsCache(FakeClient(FakeResponse(200, "User-agent: *\nDisallow: /private/\n")), 'TestBot/1.0',
+                         cache_dir=cache_dir)
+    assert robots.can_fetch('https://example.com/page/')
+    assert not robots.can_fetch('https://example.com/private/page/')
+    assert os.listdir(cache_dir)
+
+def test_network_error_is_retried_after_error_ttl():
+    client = FakeClient(requests.ConnectionError("refused"), FakeResponse(200, "User-agent: *\nDisallow: /\n"))
+    robots = RobotsCache(client, 'TestBot/1.0', error_ttl=0)
+
+    assert not robots.can_fetch('https://example.com/page/')
+    assert not robots.can_fetch('https://example.com/page/')
+    assert client.requests == 2
+
+def test_missing_robots_txt_allows_everything():
+    robots = RobotsCache(FakeClient(FakeResponse(404)), 'TestBot/1.0')
+
+    assert robots.can_fetch('https://example.com/page/')
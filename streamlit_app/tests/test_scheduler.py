@@ -0,0 +1,30 @@
+from collections import defaultdict, deque
+
+from utils.crawler import WebCrawler
+
+def test_busy_host_parks_at_most_concurrency_urls():
+    crawler = WebCrawler(delay=0, concurrency=4, per_host_concurrency=1)
+    for index in range(100):
+        crawler.urls_to_visit.push(f"https://busy.example/page-{index}/", 1)
+    crawler.urls_to_visit.push("https://idle.example/", 1)
+    host_active = defaultdict(int, {'busy.example': 1})
+    deferred = defaultdict(deque)
+
+    # The idle host's URL is behind the busy host's, so parking stops first
+    assert crawler._next_task(host_active, deferred) is None
+    assert sum(len(queue) for queue in deferred.values()) == crawler.concurrency
+    assert len(crawler.urls_to_visit) == 101 - crawler.concurrency
+
+    # Parked URLs come out first once the host has a free slot
+    host_active['busy.example'] = 0
+    assert crawler._next_task(host_active, deferred) == ("https://busy.example/page-0/", 1)
+
+def test_free_host_is_not_held_up_by_parked_urls():
+    crawler = WebCrawler(delay=0, concurrency=4, per_host_concurrency=1)
+    crawler.urls_to_visit.push("https://busy.example/a/", 1)
+    crawler.urls_to_visit.push("https://idle.example/", 1)
+    host_active = defaultdict(int, {'busy.example': 1})
+    deferred = defaultdict(deque)
+
+    assert crawler._next_task(host_active, deferred) == ("https://idle.example/", 1)
+    assert list(deferred['busy.example']) == [("https://busy.example/a/", 1)]
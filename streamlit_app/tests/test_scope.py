@@ -0,0 +1,27 @@
+import pytest
+
+from utils.scope import ScopeRules
+
+def test_patterns_with_inline_flags_combine():
+    scope = ScopeRules(exclude=['re:(?i)/cart', '/search*', r're:/(\w+)/\1/'], max_segment_repeats=None)
+
+    assert scope.check('https://example.com/CART/items') == 'excluded'
+    assert scope.check('https://example.com/search?q=seo') == 'excluded'
+    assert scope.check('https://example.com/tag/tag/') == 'excluded'
+    assert scope.check('https://example.com/tag/seo/') is None
+
+@pytest.mark.parametrize('pattern', ['re:/blog(', 're:/x(?i)y', 're:[z-a]'])
+def test_invalid_pattern_names_it(pattern):
+    with pytest.raises(ValueError) as excinfo:
+        ScopeRules(exclude=['/cart/*', pattern])
+    assert repr(pattern) in str(excinfo.value)
+
+def test_rejected_urls_are_counted_once():
+    scope = ScopeRules(exclude=['/cart/*'])
+
+    for _ in range(3):
+        assert not scope.admit('https://example.com/cart/add')
+    assert not scope.admit('https://example.com/cart/view')
+    assert scope.admit('https://example.com/blog/')
+
+    assert scope.rejected == {'excluded': 2}
@@ -0,0 +1,38 @@
+import pytest
+
+from utils.crawler import WebCrawler
+from utils.sinks import JSONLSink, ParquetSink
+
+def test_new_crawl_replaces_sink_output(site_server, tmp_path):
+    sink = JSONLSink(str(tmp_path / 'pages.jsonl'), batch_size=5)
+    crawler = WebCrawler(delay=0, max_pages=20, concurrency=4, per_host_concurrency=4, sink=sink, keep_pages=False)
+
+    crawler.crawl(site_server.url)
+    crawler.crawl(site_server.url)
+
+    assert len(crawler.get_pages_df()) == crawler.pages_indexed == 20
+    assert sink.pages_written == 20
+
+def test_resume_keeps_sink_output(site, site_server, tmp_path):
+    path = str(tmp_path / 'pages.jsonl')
+    options = dict(delay=0, max_pages=1000, max_depth=10, concurrency=4, per_host_concurrency=4, keep_pages=False,
+                   checkpoint_path=str(tmp_path / 'crawl.db'), checkpoint_every=10)
+
+    first = WebCrawler(sink=JSONLSink(path, batch_size=5), **options)
+    for index, _ in enumerate(first.crawl_iter(site_server.url)):
+        if index == 39:
+            break
+    # Pages written after the last checkpoint, as if the crawl had been killed
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"url": "written after the checkpoint"}\n{"url": "cut off mid-')
+
+    resumed = WebCrawler(sink=JSONLSink(path, batch_size=5), **options)
+    resumed.resume()
+
+    urls = [page['url'] for page in resumed.iter_pages()]
+    assert resumed.pages_indexed == resumed.sink.pages_written == site.num_pages
+    assert len(urls) == len(set(urls)) == site.num_pages
+
+def test_parquet_sink_cannot_be_checkpointed(tmp_path):
+    with pytest.raises(ValueError):
+        WebCrawler(sink=ParquetSink(str(tmp_path / 'pages.parquet')), checkpoint_path=str(tmp_path / 'crawl.db'))
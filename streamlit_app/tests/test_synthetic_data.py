@@ -0,0 +1,26 @@
+import numpy as np
+
+from utils.synthetic_data import SimulatedSimilarity
+
+def test_simulated_similarity_is_symmetric_and_repeatable():
+    topics = np.arange(500) % 7
+    similarity = SimulatedSimilarity(500, topics, seed=3)
+
+    block = similarity[:500, :500]
+    assert block.shape == (500, 500)
+    assert np.array_equal(block, block.T)
+    assert np.all(np.diag(block) == 1)
+    assert np.array_equal(similarity[42], block[42])
+    assert similarity[3, 10] == block[3, 10]
+    assert np.array_equal(SimulatedSimilarity(500, topics, seed=3)[42], block[42])
+
+    off_diagonal = ~np.eye(500, dtype=bool)
+    same_topic = (topics[:, None] == topics[None, :]) & off_diagonal
+    assert block[same_topic].min() >= 0.5 and block[off_diagonal & ~same_topic].max() <= 0.5
+
+def test_simulated_similarity_rows_need_no_matrix():
+    similarity = SimulatedSimilarity(1_000_000, seed=1)
+
+    row = similarity[123456]
+    assert row.shape == (1_000_000,)
+    assert 0.1 <= np.delete(row, 123456).min() and row.max() == 1
@@ -0,0 +1,36 @@
+from utils.crawler import WebCrawler
+from utils.frontier import UrlListFrontier
+
+def counting(urls, counter):
+    for url in urls:
+        counter[0] += 1
+        yield url
+
+def test_url_list_is_read_lazily(site, site_server):
+    read = [0]
+    # Most of these are 404s, which is fine for counting reads
+    urls = [site_server.url.rstrip('/') + site.path(index) for index in range(20000)]
+    crawler = WebCrawler(delay=0, max_pages=5, concurrency=8, per_host_concurrency=1)
+
+    for _ in crawler.crawl_urls_iter(counting(urls, read)):
+        break
+
+    # One read-ahead batch, not the whole input
+    assert read[0] <= 1000 + crawler.concurrency
+    assert read[0] < len(urls)
+
+def test_url_list_crawls_each_url_once(site, site_server):
+    urls = [site_server.url.rstrip('/') + site.path(index) for index in range(50)]
+    crawler = WebCrawler(delay=0, max_pages=1000, concurrency=4, per_host_concurrency=2)
+
+    results = crawler.crawl_urls(urls + urls[:10] + [''])
+
+    assert results['pages_indexed'] == 50
+    assert {page['fetched_url'] for page in crawler.iter_pages()} == set(urls)
+
+def test_url_list_frontier_ignores_links():
+    frontier = UrlListFrontier(['a', 'b', 'a'], read_ahead=2)
+    frontier.push_links(['c'], 1, source='a')
+
+    assert [frontier.pop()[0] for _ in range(2)] == ['a', 'b']
+    assert not frontier
@@ -11,6 +11,9 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import logging
 
+from utils.link_graph import link_counts
+from utils.synthetic_data import SimulatedSimilarity
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -151,14 +154,15 @@ class ContentAnalyzer:
             return []
         
         # Get similarity scores
-        similarity_scores = list(enumerate(self.similarity_matrix[page_idx]))
+        similarity_scores = np.asarray(self.similarity_matrix[page_idx])
         
-        # Sort by similarity score
-        similarity_scores = sorted(similarity_scores, key=lambda x: x[1], reverse=True)
+        # Sort by similarity score, keeping page order among ties
+        ranked = np.argsort(-similarity_scores, kind='stable')
         
         # Get top N similar pages (excluding the page itself)
         similar_pages = []
-        for idx, score in similarity_scores[1:top_n+1]:
+        for idx in ranked[1:top_n+1]:
+            score = similarity_scores[idx]
             similar_pages.append({
                 'url': self.pages_df.iloc[idx]['url'],
                 'title': self.pages_df.iloc[idx]['title'],
@@ -173,8 +177,9 @@ class ContentAnalyzer:
         if self.pages_df is None or self.links_df is None:
             return []
         
-        # Count incoming links for each page
-        incoming_links = self.links_df['target_url'].value_counts().reset_index()
+        # Count incoming links for each page, including repeats of a link
+        targets = self.links_df['target_url']
+        incoming_links = link_counts(self.links_df).groupby(targets, observed=True).sum().reset_index()
         incoming_links.columns = ['url', 'incoming_links']
         
         # Merge with pages DataFrame
@@ -254,8 +259,8 @@ class ContentAnalyzer:
                 continue
             
             # Find similar pages
-            similar_indices = [j for j in range(len(self.pages_df)) 
-                              if self.similarity_matrix[i, j] >= min_similarity and i != j]
+            similarities = np.asarray(self.similarity_matrix[i])
+            similar_indices = [j for j in np.flatnonzero(similarities >= min_similarity) if j != i]
             
             # If there are similar pages, create a cluster
             if similar_indices:
@@ -272,7 +277,7 @@ class ContentAnalyzer:
                     cluster['cluster_pages'].append({
                         'url': self.pages_df.iloc[j]['url'],
                         'title': self.pages_df.iloc[j]['title'],
-                        'similarity_score': self.similarity_matrix[i, j],
+                        'similarity_score': similarities[j],
                         'keywords': self.pages_df.iloc[j]['keywords']
                     })
                 
@@ -282,46 +287,44 @@ class ContentAnalyzer:
         
         return clusters
     
-    def simulate_analysis(self, pages_df, links_df):
-        """Simulate content analysis for testing purposes"""
+    def simulate_analysis(self, pages_df, links_df, seed=None):
+        """Simulate content analysis for testing purposes
+        
+        Pages of the same topic (when pages_df has a topic column) get
+        higher similarities. Similarities are computed on demand (see
+        SimulatedSimilarity), so no N x N matrix is allocated.
+        """
+        rng = np.random.default_rng(seed)
+        
         # Create a copy of the DataFrames
         pages = pages_df.copy()
+        n = len(pages)
         
         # Add simulated analysis results
-        pages['processed_content'] = pages['content'].apply(lambda x: x[:100] + "...")
+        pages['processed_content'] = pages['content'].str[:100] + "..."
         
-        # Generate random keywords
-        all_keywords = ['seo', 'content', 'marketing', 'internal', 'linking', 'optimization', 
-                       'strategy', 'analysis', 'website', 'traffic', 'ranking', 'search', 
-                       'engine', 'google', 'backlinks', 'authority', 'relevance', 'structure']
+        # Pick random keywords for every page at once
+        all_keywords = np.array(['seo', 'content', 'marketing', 'internal', 'linking', 'optimization', 
+                                 'strategy', 'analysis', 'website', 'traffic', 'ranking', 'search', 
+                                 'engine', 'google', 'backlinks', 'authority', 'relevance', 'structure'])
         
-        pages['keywords'] = pages.apply(lambda x: 
-            np.random.choice(all_keywords, size=min(10, len(all_keywords)), replace=False).tolist(), 
-            axis=1)
+        keyword_order = rng.random((n, len(all_keywords))).argsort(axis=1)[:, :10]
+        pages['keywords'] = all_keywords[keyword_order].tolist()
         
         # Generate random bigrams
-        all_bigrams = ['internal linking', 'content strategy', 'seo optimization', 
-                      'link building', 'search engine', 'keyword research', 
-                      'site structure', 'page authority', 'user experience']
+        all_bigrams = np.array(['internal linking', 'content strategy', 'seo optimization', 
+                                'link building', 'search engine', 'keyword research', 
+                                'site structure', 'page authority', 'user experience'])
         
-        pages['bigrams'] = pages.apply(lambda x: 
-            np.random.choice(all_bigrams, size=min(5, len(all_bigrams)), replace=False).tolist(), 
-            axis=1)
+        bigram_order = rng.random((n, len(all_bigrams))).argsort(axis=1)[:, :5]
+        pages['bigrams'] = all_bigrams[bigram_order].tolist()
         
         # Store the processed DataFrames
         self.pages_df = pages
         self.links_df = links_df
         
-        # Create a dummy similarity matrix
-        n = len(pages)
-        self.similarity_matrix = np.zeros((n, n))
-        
-        for i in range(n):
-            for j in range(n):
-                if i == j:
-                    self.similarity_matrix[i, j] = 1.0
-                else:
-                    # Random similarity between 0.1 and 0.9
-                    self.similarity_matrix[i, j] = 0.1 + 0.8 * np.random.random()
+        # Random similarity between 0.1 and 0.9, higher within a topic
+        topics = pages['topic'].to_numpy() if 'topic' in pages else None
+        self.similarity_matrix = SimulatedSimilarity(n, topics, seed=rng.integers(2 ** 63))
         
         return pages
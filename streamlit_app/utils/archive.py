@@ -0,0 +1,157 @@
+import gzip
+import os
+import threading
+import uuid
+import zlib
+from datetime import datetime, timezone
+import logging
+
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Bodies are stored decoded, so headers about the transfer encoding no longer apply
+TRANSFER_HEADERS = ('content-encoding', 'transfer-encoding', 'content-length')
+
+def warc_record(warc_type, fields, payload):
+    """Serialize one WARC/1.1 record"""
+    lines = [
+        'WARC/1.1',
+        f"WARC-Type: {warc_type}",
+        f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>",
+        f"WARC-Date: {datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}"
+    ]
+    lines.extend(f"{name}: {value}" for name, value in fields.items())
+    lines.append(f"Content-Length: {len(payload)}")
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('utf-8') + payload + b'\r\n\r\n'
+
+class ResponseArchive:
+    """Append-only archive of raw responses in the WARC format
+
+    Every record is its own gzip member, as in standard .warc.gz files, so
+    records can be appended to an existing archive (e.g. when a crawl is
+    resumed) and other WARC tools can read it. Records are compressed in
+    the fetch threads; only the write itself holds the lock.
+    """
+
+    def __init__(self, path, append=False, compresslevel=6):
+        self.path = path
+        self.compresslevel = compresslevel
+        self.lock = threading.Lock()
+        self.records = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.file = open(path, 'ab' if append else 'wb')
+
+    def write_info(self, fields):
+        """Write a warcinfo record describing the crawl"""
+        payload = ''.join(f"{name}: {value}\r\n" for name, value in fields.items()).encode('utf-8')
+        self._write(warc_record('warcinfo', {'Content-Type': 'application/warc-fields'}, payload))
+
+    def write_response(self, url, status, reason, headers, body, depth=None):
+        """Write a response record with the status line, headers and (decoded) body"""
+        lines = [f"HTTP/1.1 {status} {reason or ''}".rstrip()]
+        lines.extend(f"{name}: {value}" for name, value in headers.items() if name.lower() not in TRANSFER_HEADERS)
+        lines.append(f"Content-Length: {len(body)}")
+        payload = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1', errors='replace') + body
+
+        fields = {'WARC-Target-URI': url, 'Content-Type': 'application/http; msgtype=response'}
+        if depth is not None:
+            fields['WARC-Crawl-Depth'] = depth
+        self._write(warc_record('response', fields, payload))
+
+    def _write(self, record):
+        data = gzip.compress(record, self.compresslevel)
+        with self.lock:
+            self.file.write(data)
+            self.records += 1
+
+    def flush(self):
+        with self.lock:
+            self.file.flush()
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+def iter_records(path):
+    """Read (fields, payload) for each record of a WARC file, gzipped or not
+
+    A record cut off by an interrupted crawl ends the iteration with a
+    warning.
+    """
+    with open(path, 'rb') as raw:
+        compressed = raw.read(2) == b'\x1f\x8b'
+
+    f = gzip.open(path, 'rb') if compressed else open(path, 'rb')
+    try:
+        while True:
+            line = f.readline()
+            if not line:
+                break
+            if not line.strip():
+                continue
+
+            fields = CaseInsensitiveDict()
+            for line in iter(f.readline, b''):
+                line = line.rstrip(b'\r\n')
+                if not line:
+                    break
+                name, _, value = line.decode('utf-8').partition(':')
+                fields[name.strip()] = value.strip()
+
+            length = int(fields.get('Content-Length', 0))
+            payload = f.read(length)
+            if len(payload) < length:
+                raise EOFError("record is truncated")
+            yield fields, payload
+    except (EOFError, zlib.error, ValueError) as e:
+        logger.warning(f"Stopped reading {path}: {e}")
+    finally:
+        f.close()
+
+def read_archive_info(path):
+    """Get the fields of the archive's first warcinfo record"""
+    for fields, payload in iter_records(path):
+        if fields.get('WARC-Type') == 'warcinfo':
+            info = {}
+            for line in payload.decode('utf-8').splitlines():
+                name, _, value = line.partition(':')
+                if name:
+                    info[name.strip()] = value.strip()
+            return info
+        break
+    return {}
+
+def iter_responses(path):
+    """Turn the archive's 200 responses back into the downloads build_page takes"""
+    for fields, payload in iter_records(path):
+        if fields.get('WARC-Type') != 'response':
+            continue
+
+        head, _, body = payload.partition(b'\r\n\r\n')
+        status_line, *header_lines = head.decode('latin-1').split('\r\n')
+        if status_line.split(' ', 2)[1:2] != ['200']:
+            continue
+
+        headers = CaseInsensitiveDict()
+        for line in header_lines:
+            name, _, value = line.partition(':')
+            headers[name.strip()] = value.strip()
+
+        # Keep the original crawl time, in local time like crawled_at
+        fetched_at = datetime.strptime(fields['WARC-Date'], '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=timezone.utc)
+
+        yield {
+            'url': fields['WARC-Target-URI'],
+            'depth': int(fields.get('WARC-Crawl-Depth', 0)),
+            'body': body,
+            'encoding': get_encoding_from_headers(headers),
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'crawled_at': fetched_at.astimezone().replace(tzinfo=None).isoformat(),
+            'timings': {}
+        }
@@ -0,0 +1,92 @@
+import json
+import os
+import sqlite3
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS pages (id INTEGER PRIMARY KEY, data TEXT);
+CREATE TABLE IF NOT EXISTS seen (url TEXT PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS frontier (position INTEGER PRIMARY KEY, url TEXT, depth INTEGER);
+CREATE UNIQUE INDEX IF NOT EXISTS frontier_url ON frontier (url);
+"""
+
+class CrawlCheckpoint:
+    """SQLite store holding enough crawl state to resume an interrupted crawl"""
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+
+    def exists(self):
+        """Check if the store holds a checkpoint"""
+        return self.conn.execute("SELECT 1 FROM meta WHERE key = 'state'").fetchone() is not None
+
+    def reset(self):
+        """Remove any previous checkpoint"""
+        with self.conn:
+            for table in ('meta', 'pages', 'seen', 'frontier'):
+                self.conn.execute(f"DELETE FROM {table}")
+
+    def save(self, state, new_pages, new_seen, queued, done):
+        """Write one checkpoint atomically
+
+        Pages and seen URLs are appended, and the frontier is updated with
+        only what changed since the last checkpoint: queued (url, depth)
+        pairs are added (or lowered to the new depth) and done URLs removed.
+        The state dict replaces the previous one.
+        """
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO pages (data) VALUES (?)",
+                ((json.dumps(page),) for page in new_pages)
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO seen (url) VALUES (?)",
+                ((url,) for url in new_seen)
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO frontier (url, depth) VALUES (?, ?)",
+                queued
+            )
+            self.conn.executemany(
+                "UPDATE frontier SET depth = ? WHERE url = ? AND depth > ?",
+                ((depth, url, depth) for url, depth in queued)
+            )
+            self.conn.executemany(
+                "DELETE FROM frontier WHERE url = ?",
+                ((url,) for url in done)
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('state', ?)",
+                (json.dumps(state),)
+            )
+
+    def load_state(self):
+        """Get the crawl state dict saved with the last checkpoint"""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'state'").fetchone()
+        return json.loads(row[0]) if row else None
+
+    def iter_pages(self):
+        """Stream the checkpointed pages in crawl order"""
+        for (data,) in self.conn.execute("SELECT data FROM pages ORDER BY id"):
+            yield json.loads(data)
+
+    def iter_seen(self):
+        for (url,) in self.conn.execute("SELECT url FROM seen"):
+            yield url
+
+    def iter_frontier(self):
+        for url, depth in self.conn.execute("SELECT url, depth FROM frontier ORDER BY position"):
+            yield url, depth
+
+    def close(self):
+        self.conn.close()
@@ -1,100 +1,305 @@
 import requests
-from bs4 import BeautifulSoup
 import time
 import re
+import json
 import urllib.parse
-from urllib.robotparser import RobotFileParser
 from datetime import datetime
-import random
-from collections import deque
+import itertools
+import multiprocessing
+from collections import deque, defaultdict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+import os
 import pandas as pd
 import logging
 
+from utils.archive import ResponseArchive, iter_responses, read_archive_info
+from utils.checkpoint import CrawlCheckpoint
+from utils.frontier import Frontier, PriorityFrontier, UrlListFrontier
+from utils.html_parser import clean_text, parse_html, parse_links, resolve_backend
+from utils.link_checker import LinkChecker
+from utils.link_graph import LinkGraph, PageList
+from utils.metrics import CrawlMetrics
+from utils.http_client import CircuitOpenError, HttpClient, RETRY_STATUSES, read_limited
+from utils.robots import RobotsCache
+from utils.simhash import SimHashIndex, simhash
+from utils.synthetic_data import generate_site_data
+from utils.sitemap import SitemapReader
+from utils.url_normalizer import URLNormalizer
+from utils.throttle import AutoThrottle, HostThrottle
+
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+SKIPPED_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.pdf', '.zip', '.css', '.js')
+NEAR_DUPLICATE_MODES = (None, 'flag', 'collapse')
+SCHEDULING_MODES = ('fifo', 'opic')
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+def resolve_url(url, base_url, normalizer, domain):
+    """Resolve and normalize a URL, or return False if it should not be crawled"""
+    try:
+        # Parse the URL
+        parsed = urllib.parse.urlparse(url)
+        
+        # If it's a relative URL, join it with the base URL
+        if not parsed.netloc:
+            url = urllib.parse.urljoin(base_url, url)
+            parsed = urllib.parse.urlparse(url)
+        
+        # Normalize so equivalent URLs are only queued once
+        url = normalizer.normalize(url)
+        parsed = urllib.parse.urlparse(url)
+        
+        # Check if it's the same domain
+        if parsed.netloc != domain:
+            return False
+        
+        # Skip certain file types
+        if parsed.path.lower().endswith(SKIPPED_EXTENSIONS):
+            return False
+            
+        return url
+    except Exception as e:
+        logger.warning(f"Error validating URL {url}: {e}")
+        return False
+
+def resolve_links(raw_links, base_url, normalizer, domain, source_url=None):
+    """Turn (href, text) pairs from the parser into link records"""
+    links = []
+    for href, text in raw_links:
+        href = href.strip()
+        if href and not href.startswith(('javascript:', 'mailto:', 'tel:')):
+            valid_url = resolve_url(href, base_url, normalizer, domain)
+            if valid_url:
+                link_text = text.strip()
+                links.append({
+                    'url': valid_url,
+                    'text': link_text if link_text else '[No Text]',
+                    'source_url': source_url or base_url
+                })
+    return links
+
+def build_page(fetched, parser, normalizer, domain, fingerprint=False, links_only=False):
+    """Parse a downloaded page into a page record
+    
+    Only takes picklable arguments so it can run in a parser process.
+    With fingerprint, the record also gets the content's SimHash. With
+    links_only, only the links, title and canonical are parsed and the
+    text fields are left empty.
+    """
+    url = fetched['url']
+    started = time.monotonic()
+    
+    # Parse the HTML in a single pass
+    html = fetched['body'].decode(fetched['encoding'] or 'utf-8', errors='replace')
+    parsed = parse_links(html, parser) if links_only else parse_html(html, parser)
+    
+    # Record the page under its canonical URL when it names one on this site
+    page_url = url
+    if parsed['canonical']:
+        page_url = resolve_url(parsed['canonical'], url, normalizer, domain) or url
+    
+    links = resolve_links(parsed['links'], url, normalizer, domain, source_url=page_url)
+    
+    logger.info(f"Crawled {url} (depth: {fetched['depth']}, links: {len(links)})")
+    page = {
+        'url': page_url,
+        'fetched_url': url,
+        'domain': domain,
+        'title': parsed['title'],
+        'description': parsed['description'],
+        'h1': parsed['h1'],
+        'h2s': parsed['h2s'],
+        'content': parsed['content'],
+        'links': links,
+        'depth': fetched['depth'],
+        'crawled_at': datetime.now().isoformat(),
+        'etag': fetched['etag'],
+        'last_modified': fetched['last_modified']
+    }
+    if fingerprint:
+        page['simhash'] = simhash(parsed['content']) if parsed['content'] else None
+    page['timings'] = dict(fetched['timings'], parse=time.monotonic() - started)
+    return page
+
+def new_parse_pool(workers):
+    """Start a process pool for build_page
+    
+    Workers are spawned rather than forked: forking while fetch threads
+    hold locks (logging's among them) can leave a worker deadlocked.
+    """
+    return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'))
+
 class WebCrawler:
-    def __init__(self, respect_robots=True, delay=1, max_pages=100, max_depth=3):
+    def __init__(self, respect_robots=True, delay=1, max_pages=100, max_depth=3,
+                 concurrency=1, per_host_concurrency=1, pool_size=None, max_retries=3,
+                 use_sitemaps=False, parser='auto', url_normalizer=None,
+                 max_frontier_size=100000, frontier_spill_dir=None,
+                 checkpoint_path=None, checkpoint_every=100, sink=None, keep_pages=True,
+                 robots_cache_dir=None, robots_ttl=86400,
+                 allowed_content_types=HTML_CONTENT_TYPES, max_page_bytes=5 * 1024 * 1024,
+                 parse_workers=0, parse_queue_size=None,
+                 auto_throttle=False, min_delay=0, max_delay=60,
+                 near_duplicates=None, duplicate_distance=6, follow_duplicate_links=True,
+                 archive_path=None, scheduling='fifo', scope=None, links_only=False,
+                 failure_threshold=5, reset_timeout=30, max_circuit_trials=3):
+        if near_duplicates not in NEAR_DUPLICATE_MODES:
+            raise ValueError("near_duplicates must be None, 'flag' or 'collapse'")
+        if scheduling not in SCHEDULING_MODES:
+            raise ValueError("scheduling must be 'fifo' or 'opic'")
+        if links_only and near_duplicates:
+            raise ValueError("near_duplicates needs page content, which links_only skips")
+        if checkpoint_path and sink is not None and not sink.can_resume:
+            raise ValueError("checkpoint_path needs a sink that can be appended to, such as JSONLSink")
+        
+        # 'fifo' crawls breadth-first; 'opic' fetches the most linked-to URLs first
+        self.scheduling = scheduling
+        
+        # Optional ScopeRules applied to every URL before it is queued
+        self.scope = scope
+        
+        # Only parse links, title and canonical, for link-graph audits
+        self.links_only = links_only
         self.visited_urls = set()
-        self.urls_to_visit = deque()
-        self.pages = []
+        # Caps the queued URLs held in memory, not the seen URLs
+        self.max_frontier_size = max_frontier_size
+        self.frontier_spill_dir = frontier_spill_dir
+        self.urls_to_visit = self._new_frontier()
+        self.link_graph = LinkGraph()
+        self.pages_indexed = 0
+        self.pages = PageList(self.link_graph)
+        self.link_checker = None
+        self.simulated_data = None
+        self.sink = sink
+        self.keep_pages = keep_pages or sink is None
         self.respect_robots = respect_robots
         self.delay = delay
         self.max_pages = max_pages
         self.max_depth = max_depth
-        self.robot_parsers = {}
+        self.concurrency = max(1, concurrency)
+        self.per_host_concurrency = max(1, per_host_concurrency)
+        self.auto_throttle = auto_throttle
+        
+        # Auto-throttle starts each host at delay and one request at a time,
+        # then adapts within the bounds, up to per_host_concurrency
+        if auto_throttle:
+            self.throttle = AutoThrottle(delay, min_delay, max_delay, max_concurrency=self.per_host_concurrency)
+        else:
+            self.throttle = HostThrottle(delay)
+        self.use_sitemaps = use_sitemaps
+        self.parser = resolve_backend(parser)
+        self.parse_workers = parse_workers
+        self.parse_queue_size = parse_queue_size or 4 * max(1, parse_workers)
+        self.url_normalizer = url_normalizer or URLNormalizer()
+        self.near_duplicates = near_duplicates
+        self.duplicate_distance = duplicate_distance
+        self.follow_duplicate_links = follow_duplicate_links
+        self.simhash_index = SimHashIndex(duplicate_distance)
+        self.allowed_content_types = tuple(allowed_content_types)
+        self.max_page_bytes = max_page_bytes
+        self.skipped = []
+        self.metrics = CrawlMetrics()
         self.headers = {
             'User-Agent': 'InternalLinkingSEOPro/1.0 (+https://example.com/bot)'
         }
+        
+        # Pooled keep-alive session shared by all workers; a host's circuit
+        # opens after failure_threshold failures and its URLs are skipped once
+        # max_circuit_trials trial requests in a row have failed
+        self.client = HttpClient(
+            headers=self.headers,
+            pool_size=pool_size or max(10, self.concurrency),
+            max_retries=max_retries,
+            failure_threshold=failure_threshold,
+            reset_timeout=reset_timeout,
+            max_trials=max_circuit_trials
+        )
+        
+        # robots.txt goes through the same client, with a short timeout and a disk cache
+        self.robots = RobotsCache(
+            self.client,
+            self.headers['User-Agent'],
+            cache_dir=robots_cache_dir,
+            ttl=robots_ttl,
+            on_load=self.apply_crawl_delay
+        )
+        self.previous_pages = {}
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint = None
+        self.unfinished_urls = []  # taken off the frontier before the last checkpoint, not finished then
+        
+        # Raw responses for reextract(), written by the fetch workers
+        self.archive_path = archive_path
+        self.archive = None
+        self.unsaved_pages = []
+        self.crawl_results = None
         self.start_time = None
         self.end_time = None
         self.domain = None
         
+    def _new_frontier(self):
+        if self.scheduling == 'opic':
+            return PriorityFrontier(self.max_frontier_size)
+        return Frontier(self.max_frontier_size, self.frontier_spill_dir)
+    
     def is_allowed_by_robots(self, url):
         """Check if the URL is allowed by robots.txt"""
         if not self.respect_robots:
             return True
-            
-        parsed_url = urllib.parse.urlparse(url)
-        base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
         
-        if base_url not in self.robot_parsers:
-            robots_url = f"{base_url}/robots.txt"
-            parser = RobotFileParser()
-            parser.set_url(robots_url)
-            try:
-                parser.read()
-                self.robot_parsers[base_url] = parser
-            except Exception as e:
-                logger.warning(f"Error reading robots.txt for {base_url}: {e}")
-                return True
+        return self.robots.can_fetch(url)
+    
+    def apply_crawl_delay(self, base_url, parser):
+        """Never crawl a host faster than its robots.txt Crawl-delay"""
+        if not self.respect_robots:
+            return
         
-        return self.robot_parsers[base_url].can_fetch(self.headers['User-Agent'], url)
+        crawl_delay = self.robots.crawl_delay(base_url)
+        if crawl_delay is None:
+            return
+        
+        # Also a floor for the auto-throttle
+        host = urllib.parse.urlparse(base_url).netloc
+        if crawl_delay > self.throttle.get_delay(host):
+            logger.info(f"Using Crawl-delay of {crawl_delay}s for {host}")
+        self.throttle.set_min_delay(host, crawl_delay)
     
     def is_valid_url(self, url, base_url):
-        """Check if the URL is valid and belongs to the same domain"""
-        try:
-            # Parse the URL
-            parsed = urllib.parse.urlparse(url)
-            
-            # If it's a relative URL, join it with the base URL
-            if not parsed.netloc:
-                url = urllib.parse.urljoin(base_url, url)
-                parsed = urllib.parse.urlparse(url)
-            
-            # Check if it's the same domain
-            if parsed.netloc != self.domain:
-                return False
-            
-            # Skip URLs with fragments
-            if parsed.fragment:
-                url = url.split('#')[0]
-            
-            # Skip certain file types
-            if any(url.lower().endswith(ext) for ext in ['.jpg', '.jpeg', '.png', '.gif', '.pdf', '.zip', '.css', '.js']):
-                return False
-                
-            return url
-        except Exception as e:
-            logger.warning(f"Error validating URL {url}: {e}")
+        """Check if the URL is valid, belongs to the same domain and is not excluded by the scope rules"""
+        url = resolve_url(url, base_url, self.url_normalizer, self.domain)
+        if url and self.scope is not None and self.scope.check(url):
             return False
+        return url
+    
+    def filter_scope(self, urls):
+        """Drop new URLs that are out of scope
+        
+        URLs the frontier has already seen are kept, so links to them
+        still count for scheduling.
+        """
+        if self.scope is None:
+            return urls
+        
+        kept = []
+        admitted = set()
+        for url in urls:
+            if url in self.urls_to_visit or url in admitted:
+                kept.append(url)
+            elif self.scope.admit(url):
+                admitted.add(url)
+                kept.append(url)
+        return kept
     
     def extract_links(self, soup, base_url):
         """Extract links from the page"""
-        links = []
-        for a_tag in soup.find_all('a', href=True):
-            href = a_tag.get('href', '').strip()
-            if href and not href.startswith(('javascript:', 'mailto:', 'tel:')):
-                valid_url = self.is_valid_url(href, base_url)
-                if valid_url:
-                    link_text = a_tag.get_text().strip()
-                    links.append({
-                        'url': valid_url,
-                        'text': link_text if link_text else '[No Text]',
-                        'source_url': base_url
-                    })
-        return links
+        raw_links = ((a_tag.get('href', ''), a_tag.get_text()) for a_tag in soup.find_all('a', href=True))
+        return self.resolve_links(raw_links, base_url)
+    
+    def resolve_links(self, raw_links, base_url, source_url=None):
+        """Turn (href, text) pairs from the parser into link records"""
+        return resolve_links(raw_links, base_url, self.url_normalizer, self.domain, source_url)
     
     def extract_content(self, soup):
         """Extract main content from the page"""
@@ -103,18 +308,7 @@ class WebCrawler:
             script.extract()
         
         # Get text
-        text = soup.get_text()
-        
-        # Break into lines and remove leading and trailing space on each
-        lines = (line.strip() for line in text.splitlines())
-        
-        # Break multi-headlines into a line each
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        
-        # Remove blank lines
-        content = '\n'.join(chunk for chunk in chunks if chunk)
-        
-        return content
+        return clean_text(soup.get_text())
     
     def extract_metadata(self, soup, url):
         """Extract metadata from the page"""
@@ -147,111 +341,781 @@ class WebCrawler:
         
         return metadata
     
+    def record_skip(self, url, depth, reason, detail=''):
+        """Remember why a URL produced no page
+        
+        Called from the fetch workers; list.append is atomic.
+        """
+        self.metrics.record_skip(reason)
+        self.skipped.append({
+            'url': url,
+            'depth': depth,
+            'reason': reason,
+            'detail': detail,
+            'skipped_at': datetime.now().isoformat()
+        })
+    
+    def check_content_type(self, response):
+        """Get the reason to skip a response from its headers, or None to read it"""
+        content_type = response.headers.get('Content-Type', '')
+        mime_type = content_type.split(';', 1)[0].strip().lower()
+        
+        # Servers that send no Content-Type get the benefit of the doubt
+        if mime_type and mime_type not in self.allowed_content_types:
+            return 'content_type', mime_type
+        
+        content_length = response.headers.get('Content-Length', '')
+        if self.max_page_bytes and content_length.isdigit() and int(content_length) > self.max_page_bytes:
+            return 'too_large', f"{content_length} bytes"
+        
+        return None
+    
     def crawl_page(self, url, depth=0):
         """Crawl a single page and extract information"""
         if url in self.visited_urls or depth > self.max_depth:
             return None
         
-        if not self.is_allowed_by_robots(url):
-            logger.info(f"Skipping {url} (disallowed by robots.txt)")
+        self.visited_urls.add(url)
+        
+        try:
+            page = self.fetch_page(url, depth)
+        except CircuitOpenError as e:
+            self.record_skip(url, depth, 'circuit_open', str(e))
             return None
+        if page:
+            self.add_page(page)
         
-        self.visited_urls.add(url)
+        return page
+    
+    def fetch_page(self, url, depth=0):
+        """Fetch and parse a single page without touching the crawl state"""
+        fetched = self.download_page(url, depth)
+        if fetched is None or 'body' not in fetched:
+            return fetched
         
         try:
-            # Add delay to be respectful
-            time.sleep(self.delay)
+            page = build_page(fetched, self.parser, self.url_normalizer, self.domain, bool(self.near_duplicates),
+                              self.links_only)
+            self.metrics.record_stage('parse', page['timings']['parse'])
+            return page
+        except Exception as e:
+            logger.error(f"Error parsing {url}: {e}")
+            self.record_skip(url, depth, 'error', str(e))
+            return None
+    
+    def download_page(self, url, depth=0):
+        """Download a page for build_page
+        
+        Returns the raw body with the headers we keep, the stored page when
+        the server says it is unchanged (no 'body' key), or None. Both carry
+        the time spent in each stage so far as 'timings'.
+        """
+        timings = {}
+        try:
+            return self._download(url, depth, timings)
+        finally:
+            self.metrics.record_timings(timings)
+    
+    def _download(self, url, depth, timings):
+        started = time.monotonic()
+        allowed = self.is_allowed_by_robots(url)
+        timings['robots'] = time.monotonic() - started
+        if not allowed:
+            logger.info(f"Skipping {url} (disallowed by robots.txt)")
+            self.record_skip(url, depth, 'robots')
+            return None
+        
+        try:
+            # Wait for the host's politeness delay
+            host = urllib.parse.urlparse(url).netloc
+            timings['politeness'] = self.throttle.wait(host)
+            
+            # Revalidate pages we already have from the previous crawl
+            previous = self.previous_pages.get(url)
+            conditional_headers = {}
+            if previous:
+                if previous.get('etag'):
+                    conditional_headers['If-None-Match'] = previous['etag']
+                if previous.get('last_modified'):
+                    conditional_headers['If-Modified-Since'] = previous['last_modified']
             
-            # Fetch the page
-            response = requests.get(url, headers=self.headers, timeout=10)
+            # Fetch the headers first so the body is only read when we want it,
+            # reporting the response time to the throttle
+            started = time.monotonic()
+            try:
+                response = self.client.get(url, headers=conditional_headers, stream=True)
+            except CircuitOpenError:
+                raise
+            except requests.RequestException:
+                self.throttle.record(host, time.monotonic() - started, ok=False)
+                self.metrics.record_response('error')
+                raise
+            finally:
+                # Split the wait into new-connection setup and the server's response
+                elapsed = time.monotonic() - started
+                timings.update(self.client.last_timings())
+                timings['response'] = max(0.0, elapsed - timings.get('dns', 0) - timings.get('connect', 0))
+            self.throttle.record(host, elapsed, ok=response.status_code not in RETRY_STATUSES)
+            self.metrics.record_response(response.status_code)
+            
+            # Reuse the stored page if it hasn't changed
+            if response.status_code == 304 and previous:
+                response.close()
+                page = dict(previous, fetched_url=url, depth=depth, crawled_at=datetime.now().isoformat(), timings=timings)
+                logger.info(f"Not modified {url} (depth: {depth}, links: {len(page['links'])})")
+                return page
             
             # Check if the request was successful
             if response.status_code != 200:
                 logger.warning(f"Failed to fetch {url}: HTTP {response.status_code}")
+                response.close()
+                self.record_skip(url, depth, 'http_status', str(response.status_code))
                 return None
             
-            # Parse the HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Extract links
-            links = self.extract_links(soup, url)
+            # Skip non-HTML and oversized responses before downloading them
+            skip = self.check_content_type(response)
+            if skip:
+                logger.info(f"Skipping {url} ({skip[0]}: {skip[1]})")
+                response.close()
+                self.record_skip(url, depth, *skip)
+                return None
             
-            # Extract content
-            content = self.extract_content(soup)
+            # Stop reading bodies without a Content-Length at the byte cap
+            started = time.monotonic()
+            body = read_limited(response, self.max_page_bytes)
+            timings['download'] = time.monotonic() - started
+            # Count bytes as received (before decompression) either way
+            self.metrics.record_bytes(response.raw.tell())
+            if body is None:
+                logger.info(f"Skipping {url} (too_large: over {self.max_page_bytes} bytes)")
+                self.record_skip(url, depth, 'too_large', f"over {self.max_page_bytes} bytes")
+                return None
             
-            # Extract metadata
-            metadata = self.extract_metadata(soup, url)
+            if self.archive is not None:
+                self.archive.write_response(url, response.status_code, response.reason, response.headers, body, depth)
             
-            # Create page object
-            page = {
+            return {
                 'url': url,
-                'domain': self.domain,
-                'title': metadata['title'],
-                'description': metadata['description'],
-                'h1': metadata['h1'],
-                'h2s': metadata['h2s'],
-                'content': content,
-                'links': links,
                 'depth': depth,
-                'crawled_at': datetime.now().isoformat()
+                'body': body,
+                'encoding': response.encoding,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'timings': timings
             }
             
-            # Add page to the list
-            self.pages.append(page)
-            
-            # Add links to the queue
-            for link in links:
-                link_url = link['url']
-                if link_url not in self.visited_urls:
-                    self.urls_to_visit.append((link_url, depth + 1))
-            
-            logger.info(f"Crawled {url} (depth: {depth}, links: {len(links)})")
-            return page
-            
+        except CircuitOpenError:
+            # The crawl loop retries the URL once the host's cool-down is over
+            raise
         except Exception as e:
             logger.error(f"Error crawling {url}: {e}")
+            self.record_skip(url, depth, 'error', str(e))
             return None
     
-    def crawl(self, start_url):
-        """Start crawling from the given URL"""
+    def add_page(self, page):
+        """Add a crawled page and queue its unvisited links"""
+        # Collapse non-canonical duplicates into the canonical page record
+        if page.get('fetched_url', page['url']) != page['url']:
+            if page['url'] in self.visited_urls:
+                logger.info(f"Skipping {page['fetched_url']} (duplicate of {page['url']})")
+                return False
+            self.visited_urls.add(page['url'])
+            self.urls_to_visit.mark_seen(page['url'])
+        
+        # Flag or drop pages whose content nearly matches an earlier page
+        follow_links = True
+        if self.near_duplicates:
+            original = self.check_near_duplicate(page)
+            if original:
+                follow_links = self.follow_duplicate_links
+                if self.near_duplicates == 'collapse':
+                    logger.info(f"Skipping {page['url']} (near-duplicate of {original})")
+                    self.record_skip(page.get('fetched_url', page['url']), page['depth'], 'near_duplicate', original)
+                    if follow_links:
+                        self.queue_links(page)
+                    return False
+        
+        # Add page to the list and hand it to the sink
+        self.pages_indexed += 1
+        self.metrics.record_page()
+        self.store_page(page)
+        if self.sink is not None:
+            self.sink.write(page)
+        if self.checkpoint_path:
+            self.unsaved_pages.append(page)
+        
+        if follow_links:
+            self.queue_links(page)
+        
+        return True
+    
+    def store_page(self, page):
+        """Keep a page's links in the link graph, and the rest of it in memory with keep_pages
+        
+        crawler.pages rebuilds the links from the graph when a page is read.
+        """
+        self.link_graph.add_page(page)
+        if self.keep_pages:
+            self.pages.append(page)
+    
+    def queue_links(self, page):
+        """Add a page's links to the queue; the frontier drops URLs it has already seen"""
+        if page['depth'] < self.max_depth:
+            urls = self.filter_scope([link['url'] for link in page['links']])
+            self.urls_to_visit.push_links(urls, page['depth'] + 1, source=page.get('fetched_url', page['url']))
+    
+    def check_near_duplicate(self, page):
+        """Get the URL of an earlier page with nearly the same content
+        
+        Sets the page's duplicate_of, and indexes its fingerprint when it
+        is original.
+        """
+        fingerprint = page.get('simhash')
+        if fingerprint is None and page.get('content'):
+            fingerprint = page['simhash'] = simhash(page['content'])
+        if not fingerprint:
+            page['duplicate_of'] = None
+            return None
+        
+        original = self.simhash_index.find(fingerprint)
+        page['duplicate_of'] = original
+        if original is None:
+            self.simhash_index.add(fingerprint, page['url'])
+        return original
+    
+    def seed_from_sitemaps(self, start_url):
+        """Queue URLs from the site's sitemaps, most recently modified first"""
+        reader = SitemapReader(self.client)
+        sitemap_urls = reader.discover(start_url, self.robots.sitemaps(start_url))
+        logger.info(f"Reading sitemaps: {', '.join(sitemap_urls)}")
+        
+        # Only the newest max_pages URLs can be crawled, so keep no more than that
+        entries = reader.newest_urls(
+            sitemap_urls,
+            limit=self.max_pages,
+            accept=lambda loc: self.is_valid_url(loc, start_url)
+        )
+        
+        # Sitemap URLs sit one level below the start page; queued newest first,
+        # which also orders them among equal scores in the priority frontier
+        self.urls_to_visit.push_links(self.filter_scope([url for url, _ in entries]), 1)
+        
+        logger.info(f"Seeded {len(entries)} URLs from sitemaps")
+        return len(entries)
+    
+    def _next_task(self, host_active, deferred):
+        """Pick the next URL whose host is below its concurrency limit
+        
+        URLs for busy hosts are parked in deferred, but never more than
+        concurrency of them: the frontier stays the place where queued URLs
+        live (with its memory cap, spilling and ordering), and a URL list
+        is not read ahead of the crawl.
+        """
+        for host, queue in deferred.items():
+            while queue and self.client.breaker.given_up(host):
+                self._skip_dead_host(*queue.popleft(), host)
+            while queue and not self._host_busy(host, host_active):
+                url, depth = queue.popleft()
+                if url not in self.visited_urls:
+                    return url, depth
+        
+        parked = sum(len(queue) for queue in deferred.values())
+        while parked < self.concurrency and self.urls_to_visit:
+            url, depth = self.urls_to_visit.pop()
+            if url in self.visited_urls or depth > self.max_depth:
+                continue
+            
+            # Park the URL until its host has a free slot and is not cooling down
+            host = urllib.parse.urlparse(url).netloc
+            if self.client.breaker.given_up(host):
+                self._skip_dead_host(url, depth, host)
+                continue
+            if self._host_busy(host, host_active):
+                deferred[host].append((url, depth))
+                parked += 1
+                continue
+            
+            return url, depth
+        
+        return None
+    
+    def _skip_dead_host(self, url, depth, host):
+        """Skip a URL whose host the circuit breaker has given up on"""
+        self.visited_urls.add(url)
+        self.record_skip(url, depth, 'circuit_open', f"gave up on {host}")
+    
+    def _host_busy(self, host, host_active):
+        """Check if a host is at its concurrency limit or its circuit breaker is open"""
+        return (host_active[host] >= self.throttle.get_concurrency(host, self.per_host_concurrency)
+                or self.client.breaker.blocked(host))
+    
+    def _wait_for_urls(self, waiting):
+        """Wait for more URLs once nothing is in flight
+        
+        waiting holds the (url, depth) pairs taken off the frontier but not
+        started. Returns True if there is more to crawl. A single crawler is
+        done at that point; distributed crawl workers wait for each other here.
+        """
+        return False
+    
+    def crawl(self, start_url, previous_pages=None):
+        """Start crawling from the given URL
+        
+        Pass the pages of an earlier crawl (its iter_pages(), or a JSONL
+        path from save_pages) to revalidate them with conditional requests.
+        """
+        for _ in self.crawl_iter(start_url, previous_pages):
+            pass
+        return self.crawl_results
+    
+    def crawl_iter(self, start_url, previous_pages=None):
+        """Crawl from the given URL, yielding each page as soon as it is parsed
+        
+        The crawl() result dict is available as crawl_results once the
+        iterator is exhausted.
+        """
         self.start_time = datetime.now()
+        start_url = self.url_normalizer.normalize(start_url)
+        
+        self.previous_pages = self._index_previous_pages(previous_pages)
         
         # Parse the domain from the start URL
         parsed_url = urllib.parse.urlparse(start_url)
         self.domain = parsed_url.netloc
         
-        # Reset state
+        self._reset_crawl_state(self._new_frontier())
+        
+        if self.checkpoint_path:
+            self._open_checkpoint().reset()
+            self.urls_to_visit.track_new = True
+        
+        if self.archive_path:
+            self.archive = ResponseArchive(self.archive_path)
+            self.archive.write_info({'software': self.headers['User-Agent'], 'start-url': start_url, 'domain': self.domain})
+        
+        self.urls_to_visit.push(start_url, 0)
+        if self.use_sitemaps:
+            self.seed_from_sitemaps(start_url)
+        
+        logger.info(f"Starting crawl of {start_url} (concurrency: {self.concurrency})")
+        yield from self._run(start_url)
+    
+    def _reset_crawl_state(self, frontier, resuming=False):
+        """Forget the previous crawl and start over with the given frontier"""
         self.visited_urls = set()
-        self.urls_to_visit = deque([(start_url, 0)])  # (url, depth)
-        self.pages = []
+        self.urls_to_visit.close()
+        self.urls_to_visit = frontier
+        self.link_graph = LinkGraph()
+        self.pages_indexed = 0
+        self.pages = PageList(self.link_graph)
+        self.link_checker = None
+        self.simulated_data = None
+        self.unsaved_pages = []
+        self.unfinished_urls = []
+        self.skipped = []
+        self.metrics = CrawlMetrics()
+        self.simhash_index = SimHashIndex(self.duplicate_distance)
+        self.client.breaker.reset()
+        if self.scope is not None:
+            self.scope.reset()
+        
+        # A new crawl replaces the sink's output; resume_iter picks it up instead
+        if self.sink is not None and not resuming:
+            self.sink.reset()
+    
+    def _index_previous_pages(self, previous_pages):
+        """Map the pages of an earlier crawl by the URL they were fetched from
+        
+        Only pages with their links can be reused when unchanged; pages
+        without them are fetched in full. An archive would lose the
+        unchanged pages, so archive_path is refused.
+        """
+        if previous_pages is not None and self.archive_path:
+            raise ValueError("archive_path can't be combined with previous_pages: unchanged pages "
+                             "come back without a body to archive")
+        if isinstance(previous_pages, str):
+            previous_pages = self.load_pages(previous_pages)
         
-        logger.info(f"Starting crawl of {start_url}")
+        indexed = {}
+        without_links = 0
+        for page in previous_pages or []:
+            if 'links' not in page:
+                without_links += 1
+                continue
+            indexed[page.get('fetched_url', page['url'])] = page
+        
+        if without_links:
+            logger.warning(f"{without_links} previous pages have no links and will be fetched in full")
+        return indexed
+    
+    def crawl_urls(self, urls, previous_pages=None):
+        """Fetch the given URLs without following their links
+        
+        urls can be any iterable, e.g. a list, a generator or an open file
+        with one URL per line; it is read lazily. Politeness, extraction,
+        the sink and max_pages work as in crawl(), and links are still
+        recorded for pages on the first URL's domain.
+        """
+        for _ in self.crawl_urls_iter(urls, previous_pages):
+            pass
+        return self.crawl_results
+    
+    def crawl_urls_iter(self, urls, previous_pages=None):
+        """Fetch the given URLs, yielding each page as soon as it is parsed"""
+        if self.checkpoint_path:
+            raise ValueError("URL list crawls can't be checkpointed")
+        
+        urls = (self.url_normalizer.normalize(url) for url in map(str.strip, urls) if url)
+        start_url = next(urls, None)
+        if start_url is None:
+            raise ValueError("No URLs given")
+        
+        self.start_time = datetime.now()
+        self.previous_pages = self._index_previous_pages(previous_pages)
+        self.domain = urllib.parse.urlparse(start_url).netloc
         
-        # Crawl until we reach the maximum number of pages or run out of URLs
-        while self.urls_to_visit and len(self.pages) < self.max_pages:
-            url, depth = self.urls_to_visit.popleft()
-            self.crawl_page(url, depth)
+        self._reset_crawl_state(UrlListFrontier(itertools.chain([start_url], urls)))
         
+        if self.archive_path:
+            self.archive = ResponseArchive(self.archive_path)
+            self.archive.write_info({'software': self.headers['User-Agent'], 'start-url': start_url, 'domain': self.domain})
+        
+        logger.info(f"Starting URL list crawl from {start_url} (concurrency: {self.concurrency})")
+        yield from self._run(start_url)
+    
+    def resume(self, checkpoint_path=None):
+        """Continue an interrupted crawl from its last checkpoint"""
+        for _ in self.resume_iter(checkpoint_path):
+            pass
+        return self.crawl_results
+    
+    def resume_iter(self, checkpoint_path=None):
+        """Continue an interrupted crawl, yielding each newly crawled page"""
+        if checkpoint_path:
+            self.checkpoint_path = checkpoint_path
+        if not self.checkpoint_path:
+            raise ValueError("No checkpoint path given")
+        if self.sink is not None and not self.sink.can_resume:
+            raise ValueError("checkpoint_path needs a sink that can be appended to, such as JSONLSink")
+        
+        checkpoint = self._open_checkpoint()
+        state = checkpoint.load_state()
+        if state is None:
+            raise ValueError(f"No checkpoint found in {self.checkpoint_path}")
+        
+        start_url = state['start_url']
+        self.domain = state['domain']
+        self.start_time = datetime.fromisoformat(state['start_time'])
+        self.previous_pages = {}
+        
+        self._reset_crawl_state(self._new_frontier(), resuming=True)
+        
+        # Keep the pages the sink holds up to the checkpoint and append after them
+        if self.sink is not None:
+            self.sink.resume(state.get('sink_pages'))
+        
+        # Only reload page bodies when they are kept in memory
+        page_urls = set()
+        for page in checkpoint.iter_pages():
+            self.pages_indexed += 1
+            page_urls.add(page['url'])
+            if page.get('simhash') and not page.get('duplicate_of'):
+                self.simhash_index.add(page['simhash'], page['url'])
+            self.store_page(page)
+        
+        self.urls_to_visit.restore(checkpoint.iter_seen(), checkpoint.iter_frontier())
+        
+        # Everything seen but no longer queued has been fetched, and canonical
+        # URLs recorded through an alias must not be fetched again
+        self.visited_urls = self.urls_to_visit.seen.difference(url for url, _ in self.urls_to_visit.entries())
+        self.visited_urls.update(page_urls)
+        self.urls_to_visit.track_new = True
+        
+        # Keep adding to the archive of the interrupted crawl
+        if self.archive_path:
+            self.archive = ResponseArchive(self.archive_path, append=os.path.exists(self.archive_path))
+        
+        logger.info(f"Resuming crawl of {start_url} ({self.pages_indexed} pages, {len(self.urls_to_visit)} queued)")
+        yield from self._run(start_url)
+    
+    def _open_checkpoint(self):
+        if self.checkpoint is None or self.checkpoint.path != self.checkpoint_path:
+            if self.checkpoint is not None:
+                self.checkpoint.close()
+            self.checkpoint = CrawlCheckpoint(self.checkpoint_path)
+        return self.checkpoint
+    
+    def save_checkpoint(self, start_url, pending=()):
+        """Persist new pages, newly seen URLs and the changes to the frontier
+        
+        URLs that were taken off the frontier but not finished yet are
+        passed as pending; they stay in the saved queue until they finish.
+        """
+        checkpoint = self._open_checkpoint()
+        state = {
+            'start_url': start_url,
+            'domain': self.domain,
+            'start_time': self.start_time.isoformat(),
+            'pages_indexed': self.pages_indexed,
+            'saved_at': datetime.now().isoformat()
+        }
+        
+        # Keep the sink and the archive at least as far along as the checkpoint
+        if self.sink is not None:
+            self.sink.flush()
+            state['sink_pages'] = self.sink.pages_written
+        if self.archive is not None:
+            self.archive.flush()
+        
+        # Only save what changed; pending URLs must not count as visited when
+        # the crawl resumes, so they are removed at a later checkpoint
+        pending_urls = {url for url, _ in pending}
+        queued, popped = self.urls_to_visit.drain_changes()
+        popped = self.unfinished_urls + popped
+        done = [url for url in popped if url not in pending_urls]
+        self.unfinished_urls = [url for url in popped if url in pending_urls]
+        checkpoint.save(state, self.unsaved_pages, self.urls_to_visit.drain_unsaved(), queued, done)
+        self.unsaved_pages = []
+        logger.info(f"Checkpoint saved ({self.pages_indexed} pages, {len(self.urls_to_visit) + len(pending_urls)} queued)")
+    
+    def _run(self, start_url):
+        """Run the crawl loop until the page budget or the frontier is exhausted
+        
+        Yields pages as they are added and leaves the result dict in
+        crawl_results.
+        """
+        # Workers only fetch and parse; this loop owns all crawl state
+        host_active = defaultdict(int)
+        deferred = defaultdict(deque)
+        futures = {}
+        
+        # With parse_workers, fetch threads only download and a process pool
+        # parses, so parsing is no longer limited to one core by the GIL
+        parse_pool = new_parse_pool(self.parse_workers) if self.parse_workers else None
+        fetch = self.download_page if parse_pool else self.fetch_page
+        parsing = {}
+        
+        def pending():
+            yield from ((url, depth) for url, depth, _ in futures.values())
+            yield from parsing.values()
+            for queue in deferred.values():
+                yield from queue
+        
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                while True:
+                    # Fill free slots without overshooting the page budget; stop
+                    # downloading while the parsers are behind (backpressure)
+                    while (len(futures) < self.concurrency
+                           and len(parsing) < self.parse_queue_size
+                           and self.pages_indexed + len(futures) + len(parsing) < self.max_pages):
+                        task = self._next_task(host_active, deferred)
+                        if task is None:
+                            break
+                        
+                        url, depth = task
+                        host = urllib.parse.urlparse(url).netloc
+                        self.visited_urls.add(url)
+                        host_active[host] += 1
+                        futures[executor.submit(fetch, url, depth)] = (url, depth, host)
+                    
+                    # Crawl until we reach the maximum number of pages or run out of URLs
+                    if not futures and not parsing:
+                        # URLs parked for hosts whose circuit breaker is open wait out the cool-down
+                        cooling = [host for host, queue in deferred.items()
+                                   if queue and self.client.breaker.blocked(host) and not self.client.breaker.given_up(host)]
+                        if cooling and self.pages_indexed < self.max_pages:
+                            time.sleep(max(0.05, min(self.client.breaker.retry_in(host) for host in cooling)))
+                            continue
+                        if not self._wait_for_urls(pending()):
+                            break
+                    
+                    done, _ = wait(list(futures) + list(parsing), return_when=FIRST_COMPLETED)
+                    for future in done:
+                        if future in parsing:
+                            url, depth = parsing.pop(future)
+                            try:
+                                page = future.result()
+                            except Exception as e:
+                                logger.error(f"Error parsing {url}: {e}")
+                                self.record_skip(url, depth, 'error', str(e))
+                                continue
+                            self.metrics.record_stage('parse', page['timings']['parse'])
+                        else:
+                            url, depth, host = futures.pop(future)
+                            host_active[host] -= 1
+                            try:
+                                page = future.result()
+                            except CircuitOpenError as e:
+                                # Put the URL back until the host's cool-down is over
+                                if self.client.breaker.given_up(host):
+                                    self.record_skip(url, depth, 'circuit_open', str(e))
+                                else:
+                                    self.visited_urls.discard(url)
+                                    deferred[host].append((url, depth))
+                                continue
+                            
+                            # Hand downloaded bodies to the parsers
+                            if page and 'body' in page:
+                                args = (page, self.parser, self.url_normalizer, self.domain, bool(self.near_duplicates),
+                                        self.links_only)
+                                parsing[parse_pool.submit(build_page, *args)] = (url, depth)
+                                continue
+                        
+                        if page and self.pages_indexed < self.max_pages and self.add_page(page):
+                            yield page
+                    
+                    self.metrics.sample_queue(len(self.urls_to_visit))
+                    
+                    if self.checkpoint_path and len(self.unsaved_pages) >= self.checkpoint_every:
+                        self.save_checkpoint(start_url, pending())
+        finally:
+            if parse_pool is not None:
+                # Drop queued parses by hand; shutdown(cancel_futures=True) needs Python 3.9
+                for future in parsing:
+                    future.cancel()
+                parse_pool.shutdown()
+            
+            # Also checkpoint on errors and interrupts so the crawl can be resumed
+            if self.checkpoint_path:
+                self.save_checkpoint(start_url, pending())
+            if self.sink is not None:
+                self.sink.close()
+            if self.archive is not None:
+                self.archive.close()
+                self.archive = None
+        
+        self.metrics.sample_queue(len(self.urls_to_visit), force=True)
+        self.metrics.finish()
         self.end_time = datetime.now()
         duration = (self.end_time - self.start_time).total_seconds()
         
-        logger.info(f"Crawl completed: {len(self.pages)} pages in {duration:.2f} seconds")
+        logger.info(f"Crawl completed: {self.pages_indexed} pages in {duration:.2f} seconds")
         
-        # Return crawl results
-        return {
+        # Store crawl results
+        self.crawl_results = {
+            'domain': self.domain,
+            'start_url': start_url,
+            'pages_indexed': self.pages_indexed,
+            'pages_skipped': len(self.skipped),
+            'pages_per_second': self.metrics.pages_per_second(),
+            'urls_out_of_scope': dict(self.scope.rejected) if self.scope is not None else {},
+            'start_time': self.start_time.isoformat(),
+            'end_time': self.end_time.isoformat(),
+            'duration': duration,
+            'date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+    
+    def reextract(self, archive_path=None, workers=None):
+        """Rebuild the pages from a response archive without network access
+        
+        Runs the current extraction code over the bodies saved by a crawl
+        with archive_path, parsing on workers processes (all cores by default).
+        """
+        for _ in self.reextract_iter(archive_path, workers):
+            pass
+        return self.crawl_results
+    
+    def reextract_iter(self, archive_path=None, workers=None):
+        """Rebuild the pages from a response archive, yielding each page in crawl order"""
+        archive_path = archive_path or self.archive_path
+        if not archive_path or not os.path.exists(archive_path):
+            raise ValueError(f"No response archive found at {archive_path}")
+        
+        self.start_time = datetime.now()
+        info = read_archive_info(archive_path)
+        start_url = info.get('start-url')
+        self.domain = info.get('domain')
+        
+        self._reset_crawl_state(self._new_frontier())
+        
+        workers = workers or os.cpu_count() or 1
+        logger.info(f"Re-extracting pages from {archive_path} ({workers} workers)")
+        
+        def add(fetched, future):
+            try:
+                page = future.result()
+            except Exception as e:
+                logger.error(f"Error parsing {fetched['url']}: {e}")
+                self.record_skip(fetched['url'], fetched['depth'], 'error', str(e))
+                return None
+            
+            self.metrics.record_stage('parse', page['timings']['parse'])
+            page['crawled_at'] = fetched['crawled_at']
+            
+            # Links are queued as in a crawl but never fetched
+            self.visited_urls.add(fetched['url'])
+            return page if self.add_page(page) else None
+        
+        # Keep a bounded window of bodies in flight so memory stays flat, and
+        # add the pages in archive order
+        in_flight = deque()
+        try:
+            with new_parse_pool(workers) as pool:
+                for fetched in iter_responses(archive_path):
+                    args = (fetched, self.parser, self.url_normalizer, self.domain, bool(self.near_duplicates),
+                            self.links_only)
+                    in_flight.append((fetched, pool.submit(build_page, *args)))
+                    if len(in_flight) >= 8 * workers:
+                        page = add(*in_flight.popleft())
+                        if page:
+                            yield page
+                
+                while in_flight:
+                    page = add(*in_flight.popleft())
+                    if page:
+                        yield page
+        finally:
+            if self.sink is not None:
+                self.sink.close()
+        
+        self.metrics.finish()
+        self.end_time = datetime.now()
+        duration = (self.end_time - self.start_time).total_seconds()
+        
+        logger.info(f"Re-extraction completed: {self.pages_indexed} pages in {duration:.2f} seconds")
+        
+        self.crawl_results = {
             'domain': self.domain,
             'start_url': start_url,
-            'pages_indexed': len(self.pages),
+            'pages_indexed': self.pages_indexed,
+            'pages_skipped': len(self.skipped),
+            'pages_per_second': self.metrics.pages_per_second(),
             'start_time': self.start_time.isoformat(),
             'end_time': self.end_time.isoformat(),
             'duration': duration,
             'date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         }
     
+    def save_pages(self, path):
+        """Save crawled pages to a JSONL file for incremental re-crawls"""
+        with open(path, 'w', encoding='utf-8') as f:
+            for page in self.iter_pages():
+                f.write(json.dumps(page) + '\n')
+    
+    @staticmethod
+    def load_pages(path):
+        """Load pages saved with save_pages"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+    
+    def iter_pages(self):
+        """Iterate over crawled pages, reading them from the sink if they are not kept in memory"""
+        if self.keep_pages:
+            return iter(self.pages)
+        return self.sink.iter_pages()
+    
     def get_pages_df(self):
         """Convert pages to a DataFrame"""
-        if not self.pages:
-            return pd.DataFrame()
+        if self.simulated_data is not None:
+            return self.simulated_data[0]
+        
+        # Count links in the link graph rather than rebuilding them
+        if self.keep_pages:
+            outgoing_links = self.link_graph.outgoing_counts()
+            pages = ((page, outgoing_links[index]) for index, page in enumerate(self.pages.records))
+        else:
+            pages = ((page, len(page['links'])) for page in self.sink.iter_pages())
         
         # Create a DataFrame with basic page info
         pages_df = pd.DataFrame([
@@ -261,92 +1125,75 @@ class WebCrawler:
                 'description': page['description'],
                 'h1': page['h1'],
                 'depth': page['depth'],
-                'outgoing_links': len(page['links']),
-                'crawled_at': page['crawled_at']
+                'outgoing_links': outgoing_links,
+                'crawled_at': page['crawled_at'],
+                'duplicate_of': page.get('duplicate_of')
             }
-            for page in self.pages
+            for page, outgoing_links in pages
         ])
         
         return pages_df
     
     def get_links_df(self):
-        """Convert links to a DataFrame"""
-        if not self.pages:
-            return pd.DataFrame()
-        
-        # Flatten the links from all pages
-        all_links = []
-        for page in self.pages:
-            for link in page['links']:
-                all_links.append({
-                    'source_url': link['source_url'],
-                    'target_url': link['url'],
-                    'anchor_text': link['text']
-                })
+        """Convert links to a DataFrame
+        
+        After check_links(), each link also has its target's status,
+        redirect count, final URL and error as target_* columns.
+        """
+        if self.simulated_data is not None:
+            links_df = self.simulated_data[1]
+        else:
+            # One row per distinct source -> target link, with how often the page repeats it
+            links_df = self.link_graph.to_df()
+        
+        if self.link_checker is not None:
+            links_df = self.link_checker.annotate(links_df)
+        return links_df
+    
+    def check_links(self, concurrency=None, max_redirects=10):
+        """Check every distinct link target for broken links and redirect chains
+        
+        Targets are resolved concurrently with HEAD requests (falling back
+        to GET) through the crawl's client, robots rules and politeness
+        delays. Results are cached, so calling this again only checks new
+        targets. Returns one row per target; get_links_df() includes them.
+        """
+        if self.link_checker is None:
+            self.link_checker = LinkChecker(
+                self.client,
+                throttle=self.throttle,
+                allowed=self.is_allowed_by_robots,
+                concurrency=concurrency or self.concurrency,
+                max_redirects=max_redirects
+            )
+        elif concurrency:
+            self.link_checker.concurrency = concurrency
         
-        return pd.DataFrame(all_links)
+        if self.simulated_data is not None:
+            targets = self.simulated_data[1]['target_url'].unique()
+        else:
+            targets = self.link_graph.target_urls()
+        self.link_checker.check_all(targets)
+        return self.link_checker.to_df(targets)
     
-    def simulate_crawl(self, domain, num_pages=50):
-        """Simulate a crawl for testing purposes"""
+    def get_skipped_df(self):
+        """Convert skipped URLs and their reasons to a DataFrame"""
+        return pd.DataFrame(self.skipped, columns=['url', 'depth', 'reason', 'detail', 'skipped_at'])
+    
+    def simulate_crawl(self, domain, num_pages=50, seed=None):
+        """Simulate a crawl for testing purposes
+        
+        The pages and links are generated directly as DataFrames (see
+        generate_site_data), so sites of up to a million pages are quick.
+        Pass a seed for repeatable data.
+        """
         self.start_time = datetime.now()
         self.domain = domain
-        
-        # Generate random pages
-        for i in range(num_pages):
-            if i == 0:
-                url = f"https://{domain}/"
-            else:
-                # Create a realistic URL structure
-                sections = ['about', 'services', 'blog', 'products', 'contact']
-                if i <= len(sections):
-                    url = f"https://{domain}/{sections[i-1]}/"
-                else:
-                    section = random.choice(sections)
-                    slug = f"post-{i}" if section == 'blog' else f"item-{i}"
-                    url = f"https://{domain}/{section}/{slug}/"
-            
-            # Generate page title
-            if i == 0:
-                title = f"Home - {domain}"
-            else:
-                words = ['SEO', 'Content', 'Marketing', 'Strategy', 'Analysis', 'Internal', 'Linking', 'Optimization']
-                title = f"{random.choice(words)} {random.choice(words)} - {domain}"
-            
-            # Generate links (each page links to 3-8 other pages)
-            links = []
-            num_links = random.randint(3, 8)
-            for j in range(num_links):
-                target_index = random.randint(0, num_pages - 1)
-                if target_index == 0:
-                    target_url = f"https://{domain}/"
-                else:
-                    target_section = random.choice(sections)
-                    target_slug = f"post-{target_index}" if target_section == 'blog' else f"item-{target_index}"
-                    target_url = f"https://{domain}/{target_section}/{target_slug}/"
-                
-                link_text = f"Link to page {target_index}"
-                links.append({
-                    'url': target_url,
-                    'text': link_text,
-                    'source_url': url
-                })
-            
-            # Create page object
-            page = {
-                'url': url,
-                'domain': domain,
-                'title': title,
-                'description': f"This is a description for {url}",
-                'h1': title,
-                'h2s': [f"Section {j+1}" for j in range(random.randint(2, 5))],
-                'content': f"This is the content for {url}. It contains information about {title}.",
-                'links': links,
-                'depth': min(i, self.max_depth),
-                'crawled_at': datetime.now().isoformat()
-            }
-            
-            self.pages.append(page)
-            self.visited_urls.add(url)
+        self.link_graph = LinkGraph()
+        self.pages = PageList(self.link_graph)
+        self.link_checker = None
+        self.simulated_data = generate_site_data(num_pages, domain=domain, max_depth=self.max_depth, seed=seed)
+        self.pages_indexed = num_pages
         
         self.end_time = datetime.now()
         duration = (self.end_time - self.start_time).total_seconds()
@@ -355,7 +1202,7 @@ class WebCrawler:
         return {
             'domain': domain,
             'start_url': f"https://{domain}/",
-            'pages_indexed': len(self.pages),
+            'pages_indexed': self.pages_indexed,
             'start_time': self.start_time.isoformat(),
             'end_time': self.end_time.isoformat(),
             'duration': duration,
@@ -0,0 +1,453 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import queue
+import sqlite3
+import time
+import urllib.parse
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+import logging
+
+from utils.crawler import WebCrawler
+from utils.sinks import JSONLSink
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER);
+CREATE TABLE IF NOT EXISTS urls (url TEXT PRIMARY KEY, partition INTEGER, depth INTEGER, state INTEGER);
+CREATE INDEX IF NOT EXISTS urls_queue ON urls (partition, state);
+CREATE TABLE IF NOT EXISTS workers (worker INTEGER PRIMARY KEY, idle INTEGER);
+"""
+
+# URL states; every URL ever queued keeps its row, so the table is also the seen-set
+QUEUED = 0
+TAKEN = 1
+
+UPSERT = """
+INSERT INTO urls (url, partition, depth, state) VALUES (?, ?, ?, ?)
+ON CONFLICT (url) DO UPDATE SET depth = min(depth, excluded.depth), state = max(state, excluded.state)
+WHERE excluded.depth < depth OR excluded.state > state
+"""
+
+def url_partition(url, partitions):
+    """Get the partition (worker) owning a URL, the same in every process"""
+    digest = hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') % partitions
+
+class CrawlStore:
+    """SQLite frontier, seen-set and page budget shared by the workers of one crawl
+
+    Each worker only claims the queued URLs of its own partition. The page
+    budget is handed out in small leases so the workers together never
+    add more than max_pages pages. All workers must be on this machine
+    (WAL mode does not work over network file systems).
+    """
+
+    def __init__(self, path, timeout=60):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    @contextmanager
+    def transaction(self):
+        # Take the write lock up front; upgrading a read transaction can fail
+        # at once instead of waiting when another worker wrote meanwhile
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        self.conn.execute('COMMIT')
+
+    def setup(self, workers, max_pages):
+        """Start a new crawl, removing any previous one"""
+        with self.transaction() as conn:
+            for table in ('meta', 'urls', 'workers'):
+                conn.execute(f"DELETE FROM {table}")
+            conn.execute("INSERT INTO meta (key, value) VALUES ('budget', ?)", (max_pages,))
+            conn.executemany("INSERT INTO workers (worker, idle) VALUES (?, 0)", ((worker,) for worker in range(workers)))
+
+    def push(self, entries):
+        """Queue (url, partition, depth, state) entries, keeping each URL once
+
+        A URL that is already known keeps its row, taking the shallower
+        depth and, once taken, staying taken.
+        """
+        with self.transaction() as conn:
+            conn.executemany(UPSERT, entries)
+
+    def claim(self, partition, limit):
+        """Take up to limit queued URLs of a partition as (url, depth), oldest first"""
+        with self.transaction() as conn:
+            return self._claim(conn, partition, limit)
+
+    def _claim(self, conn, partition, limit):
+        rows = conn.execute(
+            "SELECT rowid, url, depth FROM urls WHERE partition = ? AND state = ? ORDER BY rowid LIMIT ?",
+            (partition, QUEUED, limit)
+        ).fetchall()
+        conn.executemany("UPDATE urls SET state = ? WHERE rowid = ?", ((TAKEN, rowid) for rowid, _, _ in rows))
+        return [(url, depth) for _, url, depth in rows]
+
+    def _budget(self, conn):
+        return conn.execute("SELECT value FROM meta WHERE key = 'budget'").fetchone()[0]
+
+    def lease(self, pages):
+        """Take up to pages from the remaining page budget; returns how many were granted"""
+        with self.transaction() as conn:
+            granted = min(pages, self._budget(conn))
+            conn.execute("UPDATE meta SET value = value - ? WHERE key = 'budget'", (granted,))
+        return granted
+
+    def idle(self, worker, unused_pages, entries=(), requeue=()):
+        """Mark a worker idle, handing back its unused budget and URLs
+
+        entries are newly found URLs to queue; requeue are URLs the worker
+        claimed but will not fetch now.
+        """
+        with self.transaction() as conn:
+            conn.executemany(UPSERT, entries)
+            conn.executemany("UPDATE urls SET state = ? WHERE url = ?", ((QUEUED, url) for url in requeue))
+            conn.execute("UPDATE meta SET value = value + ? WHERE key = 'budget'", (unused_pages,))
+            conn.execute("UPDATE workers SET idle = 1 WHERE worker = ?", (worker,))
+
+    def wake(self, worker, partition, pages, limit):
+        """Give an idle worker new URLs and a budget lease, if there are both
+
+        Returns (granted pages, claimed URLs); the worker stays idle when
+        nothing was claimed.
+        """
+        with self.transaction() as conn:
+            granted = min(pages, self._budget(conn))
+            if not granted:
+                return 0, []
+            entries = self._claim(conn, partition, limit)
+            if not entries:
+                return 0, []
+            conn.execute("UPDATE meta SET value = value - ? WHERE key = 'budget'", (granted,))
+            conn.execute("UPDATE workers SET idle = 0 WHERE worker = ?", (worker,))
+        return granted, entries
+
+    def finished(self):
+        """Check if the crawl is over: every worker is idle and either the
+        budget is spent or no URL is queued
+
+        Idle workers hold no budget and have queued all their URLs, so
+        neither can change again once this is true.
+        """
+        with self.transaction() as conn:
+            if conn.execute("SELECT 1 FROM workers WHERE idle = 0 LIMIT 1").fetchone():
+                return False
+            if not self._budget(conn):
+                return True
+            return conn.execute("SELECT 1 FROM urls WHERE state = ? LIMIT 1", (QUEUED,)).fetchone() is None
+
+    def counts(self):
+        """Get the number of URLs per state"""
+        return dict(self.conn.execute("SELECT state, COUNT(*) FROM urls GROUP BY state").fetchall())
+
+    def close(self):
+        self.conn.close()
+
+class SharedFrontier:
+    """Frontier stand-in for a crawl worker, backed by a CrawlStore
+
+    Pushed URLs are buffered and written to the store in batches; URLs of
+    this worker's partition come back through claims.
+    """
+
+    def __init__(self, store, worker, workers, batch_size=500, poll_interval=0.1):
+        self.store = store
+        self.worker = worker
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.queue = deque()
+        self.buffer = []
+        self.seen = set()
+        self.last_empty_claim = None
+
+        # Checkpoints are not used by crawl workers; the store is the shared state
+        self.track_new = False
+
+    def __len__(self):
+        return len(self.queue)
+
+    def __bool__(self):
+        # Claim more only when the local queue is empty, and not more than
+        # once per poll_interval while the partition has nothing queued
+        if not self.queue:
+            if self.last_empty_claim is None or time.monotonic() - self.last_empty_claim >= self.poll_interval:
+                self.flush()
+                self.queue.extend(self.store.claim(self.worker, self.batch_size))
+                self.last_empty_claim = None if self.queue else time.monotonic()
+        return bool(self.queue)
+
+    def __contains__(self, url):
+        return url in self.seen
+
+    def push(self, url, depth, state=0):
+        """Queue a URL unless this worker queued it before; returns True if added"""
+        if url in self.seen:
+            return False
+        self.seen.add(url)
+        self.buffer.append((url, url_partition(url, self.workers), depth, state))
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+        return True
+
+    def push_links(self, urls, depth, source=None):
+        for url in urls:
+            self.push(url, depth)
+
+    def pop(self):
+        return self.queue.popleft()
+
+    def mark_seen(self, url):
+        """Record a URL that was reached without going through the queue, e.g. a canonical URL"""
+        if url in self.seen:
+            return
+        self.seen.add(url)
+        self.buffer.append((url, url_partition(url, self.workers), 0, 1))
+
+    def flush(self):
+        if self.buffer:
+            self.store.push(self.buffer)
+            self.buffer = []
+
+    def drain_buffer(self):
+        buffer, self.buffer = self.buffer, []
+        return buffer
+
+    def entries(self):
+        return iter(self.queue)
+
+    def drain_unsaved(self):
+        return []
+
+    def drain_changes(self):
+        return [], []
+
+    def append(self, item):
+        self.push(*item)
+
+    def popleft(self):
+        return self.pop()
+
+    def close(self):
+        self.flush()
+
+class CrawlWorker(WebCrawler):
+    """One worker of a distributed crawl
+
+    A WebCrawler that takes its URLs from its partition of a shared
+    CrawlStore, queues every link it finds there, and leases its page
+    budget from the store.
+    """
+
+    def __init__(self, store, worker, workers, poll_interval=0.1, **crawler_options):
+        self.store = store
+        self.worker = worker
+        self.workers = workers
+        self.poll_interval = poll_interval
+        super().__init__(**crawler_options)
+
+        # Enough budget for every download and parse that can be in flight
+        self.lease_size = self.concurrency + (self.parse_queue_size if self.parse_workers else 0)
+
+    def _new_frontier(self):
+        return SharedFrontier(self.store, self.worker, self.workers, poll_interval=self.poll_interval)
+
+    def apply_crawl_delay(self, base_url, parser):
+        """Spread the host's Crawl-delay over the workers, which all fetch from it"""
+        if not self.respect_robots:
+            return
+
+        crawl_delay = self.robots.crawl_delay(base_url)
+        if crawl_delay is not None:
+            host = urllib.parse.urlparse(base_url).netloc
+            self.throttle.set_min_delay(host, crawl_delay * self.workers)
+
+    def crawl_iter(self, start_url, previous_pages=None):
+        self.max_pages = self.store.lease(self.lease_size)
+        yield from super().crawl_iter(start_url, previous_pages)
+
+    def add_page(self, page):
+        added = super().add_page(page)
+
+        # Top the lease up before it runs out so downloads never stall on it
+        held = self.max_pages - self.pages_indexed
+        if added and held <= self.lease_size // 2:
+            self.max_pages += self.store.lease(self.lease_size - held)
+        return added
+
+    def _wait_for_urls(self, waiting):
+        """Go idle until URLs for this worker's partition and budget are available"""
+        # URLs held back for lack of budget go back to the store, where they
+        # are claimed again (and skipped if they were fetched after all)
+        requeue = [url for url, _ in waiting if url not in self.visited_urls]
+        requeue.extend(url for url, _ in self.urls_to_visit.queue if url not in self.visited_urls)
+        self.urls_to_visit.queue.clear()
+
+        self.store.idle(self.worker, self.max_pages - self.pages_indexed, self.urls_to_visit.drain_buffer(), requeue)
+        self.max_pages = self.pages_indexed
+
+        while True:
+            granted, entries = self.store.wake(self.worker, self.worker, self.lease_size, self.urls_to_visit.batch_size)
+            if entries:
+                self.max_pages += granted
+                self.urls_to_visit.queue.extend(entries)
+                return True
+            if self.store.finished():
+                return False
+            time.sleep(self.poll_interval)
+
+def run_worker(store_path, worker, workers, start_url, output_path, crawler_options, results=None):
+    """Run one crawl worker to completion, writing its pages to output_path as JSONL
+
+    DistributedCrawler starts one per partition, all on the same machine:
+    the store runs SQLite in WAL mode, which needs shared memory between
+    the processes and so does not work over a network file system.
+    """
+    store = CrawlStore(store_path)
+    try:
+        crawler = CrawlWorker(store, worker, workers, sink=JSONLSink(output_path), keep_pages=False, **crawler_options)
+        crawl_results = crawler.crawl(start_url)
+        crawl_results['skipped'] = crawler.skipped
+        crawl_results['metrics'] = crawler.metrics.to_dict()
+    finally:
+        store.close()
+
+    if results is not None:
+        results.put((worker, crawl_results))
+    return crawl_results
+
+class DistributedCrawler:
+    """Crawl one site with several worker processes sharing a SQLite frontier
+
+    URLs are partitioned by hash, so each worker fetches its own share and
+    crawl time drops with the number of workers until the site or the
+    network is the limit. delay (and robots.txt Crawl-delay) applies to
+    the crawl as a whole; concurrency options apply per worker. Workers
+    write their pages to their own JSONL files, merged into pages.jsonl
+    in work_dir at the end.
+
+        crawler = DistributedCrawler(workers=4, work_dir='crawl', max_pages=100000, delay=0)
+        results = crawler.crawl('https://example.com/')
+    """
+
+    def __init__(self, workers=4, work_dir='crawl_data', max_pages=100, delay=1, poll_interval=0.1, **crawler_options):
+        if {'sink', 'checkpoint_path', 'archive_path'} & set(crawler_options):
+            raise ValueError("DistributedCrawler writes its own outputs; sink, checkpoint_path and archive_path are not supported")
+
+        self.workers = max(1, workers)
+        self.work_dir = work_dir
+        self.max_pages = max_pages
+        self.poll_interval = poll_interval
+        self.crawler_options = dict(crawler_options, delay=delay * self.workers)
+        self.store_path = os.path.join(work_dir, 'frontier.sqlite')
+        self.pages_path = os.path.join(work_dir, 'pages.jsonl')
+        self.skipped = []
+        self.worker_results = []
+        self.crawl_results = None
+
+    def worker_path(self, worker):
+        return os.path.join(self.work_dir, f"pages-{worker}.jsonl")
+
+    def crawl(self, start_url):
+        """Run all workers until the budget or the frontier is exhausted, then merge their pages"""
+        start_time = datetime.now()
+        store = CrawlStore(self.store_path)
+        store.setup(self.workers, self.max_pages)
+        store.close()
+
+        results = multiprocessing.Queue()
+        processes = []
+        for worker in range(self.workers):
+            # Only one worker reads the sitemaps
+            options = dict(self.crawler_options, max_pages=0, poll_interval=self.poll_interval)
+            options['use_sitemaps'] = options.get('use_sitemaps', False) and worker == 0
+            process = multiprocessing.Process(
+                target=run_worker,
+                args=(self.store_path, worker, self.workers, start_url, self.worker_path(worker), options, results)
+            )
+            process.start()
+            processes.append(process)
+
+        logger.info(f"Started {self.workers} crawl workers for {start_url}")
+
+        try:
+            # The others would wait forever for a worker that died, so stop them all
+            worker_results = {}
+            while len(worker_results) < self.workers:
+                try:
+                    worker, crawl_results = results.get(timeout=1)
+                    worker_results[worker] = crawl_results
+                except queue.Empty:
+                    failed = [p for p in processes if p.exitcode not in (None, 0)]
+                    if failed:
+                        raise RuntimeError(f"Crawl worker exited with code {failed[0].exitcode}")
+        finally:
+            for process in processes:
+                if len(worker_results) < self.workers:
+                    process.terminate()
+                process.join()
+
+        self.worker_results = [worker_results[worker] for worker in range(self.workers)]
+        self.skipped = [skip for result in self.worker_results for skip in result['skipped']]
+        pages_indexed = self.merge_outputs()
+
+        end_time = datetime.now()
+        duration = (end_time - start_time).total_seconds()
+        logger.info(f"Distributed crawl completed: {pages_indexed} pages in {duration:.2f} seconds")
+
+        self.crawl_results = {
+            'domain': urllib.parse.urlparse(start_url).netloc,
+            'start_url': start_url,
+            'pages_indexed': pages_indexed,
+            'pages_skipped': len(self.skipped),
+            'pages_per_second': pages_indexed / duration if duration else 0.0,
+            'workers': self.workers,
+            'start_time': start_time.isoformat(),
+            'end_time': end_time.isoformat(),
+            'duration': duration,
+            'date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+        return self.crawl_results
+
+    def merge_outputs(self):
+        """Merge the workers' page files into pages.jsonl; returns the number of pages
+
+        A canonical URL reached by two workers at once is kept once.
+        """
+        urls = set()
+        with open(self.pages_path, 'w', encoding='utf-8') as out:
+            for worker in range(self.workers):
+                path = self.worker_path(worker)
+                if not os.path.exists(path):
+                    continue
+                with open(path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        url = json.loads(line)['url']
+                        if url not in urls:
+                            urls.add(url)
+                            out.write(line)
+                os.remove(path)
+        return len(urls)
+
+    def iter_pages(self):
+        """Stream the merged pages"""
+        return JSONLSink(self.pages_path, append=True).iter_pages()
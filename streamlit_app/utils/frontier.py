@@ -0,0 +1,311 @@
+import heapq
+import itertools
+import os
+import tempfile
+from collections import deque
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+class Frontier:
+    """FIFO crawl frontier that deduplicates URLs when they are queued
+
+    At most max_in_memory URLs are held in memory. Beyond that, URLs are
+    appended to a spill file in spill_dir (read back in order once the
+    in-memory queue drains) or, without a spill_dir, dropped.
+
+    Only the queue is capped: the set of seen URLs keeps every URL ever
+    queued, so memory still grows with the size of the crawl. Spilled URLs
+    keep the depth they were queued at, even if a shallower link to them
+    turns up before they are read back.
+    """
+
+    def __init__(self, max_in_memory=100000, spill_dir=None):
+        self.max_in_memory = max(1, max_in_memory)
+        self.spill_dir = spill_dir
+        self.queue = deque()
+        self.pending = {}  # url -> shallowest depth seen while queued
+        self.seen = set()
+        self.spill_file = None
+        self.spill_read_pos = 0
+        self.spilled = 0
+        self.dropped = 0
+
+        # Newly seen, queued and popped URLs, kept only while a checkpoint needs them
+        self.track_new = False
+        self.unsaved = []
+        self.pushed = []
+        self.popped = []
+
+    def __len__(self):
+        return len(self.queue) + self.spilled
+
+    def __contains__(self, url):
+        return url in self.seen
+
+    def push(self, url, depth):
+        """Queue a URL unless it was queued before; returns True if added"""
+        queued_depth = self.pending.get(url)
+        if queued_depth is not None:
+            # Keep the shallowest depth for URLs that are still waiting
+            if depth < queued_depth:
+                self.pending[url] = depth
+                self._track_push(url, depth)
+            return False
+
+        if url in self.seen:
+            return False
+
+        # Once anything is on disk, new URLs go there too to keep FIFO order
+        if self.spilled or len(self.queue) >= self.max_in_memory:
+            if self.spill_dir is None:
+                # Dropped URLs stay unseen so a later link can queue them again
+                self.dropped += 1
+                if self.dropped == 1:
+                    logger.warning(f"Frontier full ({self.max_in_memory} URLs), dropping new URLs")
+                return False
+            self._add_seen(url)
+            self._track_push(url, depth)
+            self._spill(url, depth)
+            return True
+
+        self._add_seen(url)
+        self._track_push(url, depth)
+        self.queue.append(url)
+        self.pending[url] = depth
+        return True
+
+    def push_links(self, urls, depth, source=None):
+        """Queue the links found on the page fetched as source, or in the sitemaps when source is None"""
+        for url in urls:
+            self.push(url, depth)
+
+    def pop(self):
+        """Take the oldest queued URL as (url, depth)"""
+        if not self.queue and self.spilled:
+            self._refill()
+        url = self.queue.popleft()
+        self._track_pop(url)
+        return url, self.pending.pop(url)
+
+    def mark_seen(self, url):
+        """Record a URL that was reached without going through the queue"""
+        if url not in self.seen:
+            self._add_seen(url)
+
+    def _add_seen(self, url):
+        self.seen.add(url)
+        if self.track_new:
+            self.unsaved.append(url)
+
+    def _track_push(self, url, depth):
+        if self.track_new:
+            self.pushed.append((url, depth))
+
+    def _track_pop(self, url):
+        if self.track_new:
+            self.popped.append(url)
+
+    def drain_unsaved(self):
+        """Return the URLs seen since the last call"""
+        unsaved, self.unsaved = self.unsaved, []
+        return unsaved
+
+    def drain_changes(self):
+        """Return what changed since the last call as (pushed, popped)
+
+        pushed holds the (url, depth) pairs queued or moved to a shallower
+        depth, popped the URLs taken off the queue.
+        """
+        pushed, popped = self.pushed, self.popped
+        self.pushed, self.popped = [], []
+        return pushed, popped
+
+    def entries(self):
+        """Iterate over the queued (url, depth) pairs in order without removing them"""
+        for url in self.queue:
+            yield url, self.pending[url]
+
+        if self.spilled:
+            self.spill_file.seek(self.spill_read_pos)
+            for _ in range(self.spilled):
+                depth, url = self.spill_file.readline().rstrip('\n').split('\t', 1)
+                yield url, int(depth)
+
+    def restore(self, seen, entries):
+        """Load a saved seen-set and queue, e.g. from a checkpoint"""
+        self.seen.update(seen)
+        for url, depth in entries:
+            self.seen.discard(url)
+            self.push(url, depth)
+
+    # deque-style aliases so the frontier can stand in for urls_to_visit
+    def append(self, item):
+        self.push(*item)
+
+    def popleft(self):
+        return self.pop()
+
+    def _spill(self, url, depth):
+        if self.spill_file is None:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            self.spill_file = tempfile.TemporaryFile(mode='w+', encoding='utf-8', dir=self.spill_dir)
+            logger.info(f"Frontier full ({self.max_in_memory} URLs), spilling to disk")
+
+        self.spill_file.seek(0, os.SEEK_END)
+        self.spill_file.write(f"{depth}\t{url}\n")
+        self.spilled += 1
+
+    def _refill(self):
+        """Move the next batch of spilled URLs back into memory"""
+        self.spill_file.seek(self.spill_read_pos)
+        while self.spilled and len(self.queue) < self.max_in_memory:
+            depth, url = self.spill_file.readline().rstrip('\n').split('\t', 1)
+            self.spilled -= 1
+            self.queue.append(url)
+            self.pending[url] = int(depth)
+        self.spill_read_pos = self.spill_file.tell()
+
+        # Start a fresh file once everything on disk has been read
+        if not self.spilled:
+            self.close()
+
+    def close(self):
+        """Delete the spill file"""
+        if self.spill_file is not None:
+            self.spill_file.close()
+            self.spill_file = None
+            self.spill_read_pos = 0
+
+class PriorityFrontier(Frontier):
+    """Crawl frontier that hands out the most important queued URL first
+
+    Importance is estimated online, OPIC-style: every fetched page splits
+    its cash, plus one new unit, evenly among its links, so URLs that
+    collect links from important pages rise to the top. The sitemaps count
+    as one page linking to all their URLs. The score is the URL's cash
+    discounted by depth_decay per level, with FIFO order among equal scores,
+    so sitemap URLs (queued newest first) are taken newest first.
+
+    A lazy max-heap keeps push and pop logarithmic: raising a queued URL's
+    score adds a new heap entry and the outdated one is skipped on pop. At
+    most max_in_memory URLs are queued (seen URLs are not capped); new URLs
+    beyond that are dropped, and queued URLs lose their cash when a crawl
+    is resumed from a checkpoint.
+    """
+
+    def __init__(self, max_in_memory=100000, depth_decay=0.8, sitemap_cash=1.0):
+        super().__init__(max_in_memory)
+        self.depth_decay = depth_decay
+        self.sitemap_cash = sitemap_cash
+        self.heap = []
+        self.heap_entry = {}  # url -> sequence number of its current heap entry
+        self.cash = {}  # queued and fetched-but-not-distributed URLs
+        self.counter = itertools.count()
+
+    def __len__(self):
+        return len(self.pending)
+
+    def score(self, url):
+        return self.cash.get(url, 0.0) * self.depth_decay ** self.pending[url]
+
+    def push(self, url, depth, cash=0.0):
+        """Queue a URL, or add cash to it if it is still queued; returns True if added"""
+        queued_depth = self.pending.get(url)
+        if queued_depth is not None:
+            if cash or depth < queued_depth:
+                self.cash[url] += cash
+                if depth < queued_depth:
+                    self.pending[url] = depth
+                    self._track_push(url, depth)
+                self._schedule(url)
+            return False
+
+        if url in self.seen:
+            return False
+
+        if len(self.pending) >= self.max_in_memory:
+            self.dropped += 1
+            if self.dropped == 1:
+                logger.warning(f"Frontier full ({self.max_in_memory} URLs), dropping new URLs")
+            return False
+
+        self._add_seen(url)
+        self._track_push(url, depth)
+        self.pending[url] = depth
+        self.cash[url] = cash
+        self._schedule(url)
+        return True
+
+    def push_links(self, urls, depth, source=None):
+        """Queue a page's links, sharing out the page's cash among them"""
+        if not urls:
+            return
+        cash = self.sitemap_cash if source is None else self.cash.pop(source, 0.0) + 1.0
+        share = cash / len(urls)
+        for url in urls:
+            self.push(url, depth, share)
+
+    def _schedule(self, url):
+        sequence = next(self.counter)
+        self.heap_entry[url] = sequence
+        heapq.heappush(self.heap, (-self.score(url), sequence, url))
+
+        # Rebuild the heap once outdated entries dominate it
+        if len(self.heap) > 2 * len(self.pending) + 1000:
+            self.heap = [(-self.score(queued), self.heap_entry[queued], queued) for queued in self.pending]
+            heapq.heapify(self.heap)
+
+    def pop(self):
+        """Take the highest-scoring queued URL as (url, depth)"""
+        while self.heap:
+            _, sequence, url = heapq.heappop(self.heap)
+            if self.heap_entry.get(url) == sequence:
+                del self.heap_entry[url]
+                self._track_pop(url)
+                return url, self.pending.pop(url)
+        raise IndexError("pop from an empty frontier")
+
+    def entries(self):
+        """Iterate over the queued (url, depth) pairs, best first, without removing them"""
+        for url in sorted(self.pending, key=lambda queued: (-self.score(queued), self.heap_entry[queued])):
+            yield url, self.pending[url]
+
+class UrlListFrontier(Frontier):
+    """Crawl frontier over a given list of URLs, read lazily from any iterable
+
+    Only read_ahead URLs are held in memory at a time, so a generator or an
+    open file can feed millions of URLs. Repeated URLs are skipped and
+    links found on the pages are never queued.
+    """
+
+    def __init__(self, urls, read_ahead=1000):
+        super().__init__(read_ahead)
+        self.source = iter(urls)
+
+    def __bool__(self):
+        if not self.queue:
+            self._read()
+        return bool(self.queue)
+
+    def _read(self):
+        for url in self.source:
+            if url not in self.seen:
+                super().push(url, 0)
+                if len(self.queue) >= self.max_in_memory:
+                    return
+
+    def push(self, url, depth):
+        return False
+
+    def push_links(self, urls, depth, source=None):
+        pass
+
+    def pop(self):
+        """Take the next listed URL as (url, 0)"""
+        if not self.queue:
+            self._read()
+        url = self.queue.popleft()
+        return url, self.pending.pop(url)
@@ -0,0 +1,295 @@
+from bs4 import BeautifulSoup, SoupStrainer
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Optional fast parsers
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import lxml.etree
+    import lxml.html
+except ImportError:
+    lxml = None
+
+# Elements whose text is not part of the page content
+STRIPPED_TAGS = ('script', 'style', 'nav', 'footer', 'header')
+
+def clean_text(text):
+    """Collapse extracted text into one trimmed phrase per line"""
+    # Break into lines and remove leading and trailing space on each
+    lines = (line.strip() for line in text.splitlines())
+
+    # Break multi-headlines into a line each
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+
+    # Remove blank lines
+    return '\n'.join(chunk for chunk in chunks if chunk)
+
+def empty_result():
+    return {
+        'title': '',
+        'description': '',
+        'h1': '',
+        'h2s': [],
+        'content': '',
+        'links': [],
+        'canonical': None
+    }
+
+def parse_with_bs4(html):
+    """Extract page data with BeautifulSoup's pure-Python html.parser"""
+    soup = BeautifulSoup(html, 'html.parser')
+    result = empty_result()
+
+    # Links are taken before the stripped elements are removed
+    for a_tag in soup.find_all('a', href=True):
+        result['links'].append((a_tag.get('href', ''), a_tag.get_text()))
+
+    for element in soup(list(STRIPPED_TAGS)):
+        element.extract()
+    result['content'] = clean_text(soup.get_text())
+
+    title_tag = soup.find('title')
+    if title_tag:
+        result['title'] = title_tag.get_text().strip()
+
+    meta_desc = soup.find('meta', attrs={'name': 'description'})
+    if meta_desc:
+        result['description'] = meta_desc.get('content', '').strip()
+
+    h1_tag = soup.find('h1')
+    if h1_tag:
+        result['h1'] = h1_tag.get_text().strip()
+
+    result['h2s'] = [h2.get_text().strip() for h2 in soup.find_all('h2')]
+
+    canonical_tag = soup.find(
+        lambda tag: tag.name == 'link' and tag.has_attr('href')
+        and 'canonical' in (rel.lower() for rel in tag.get('rel', []))
+    )
+    if canonical_tag:
+        result['canonical'] = canonical_tag['href']
+    return result
+
+def parse_with_lxml(html):
+    """Extract page data from an lxml tree in a single depth-first walk"""
+    if isinstance(html, str):
+        html = html.encode('utf-8')
+
+    try:
+        root = lxml.html.document_fromstring(html, parser=lxml.html.HTMLParser(encoding='utf-8'))
+    except (lxml.etree.ParserError, ValueError):
+        return empty_result()
+
+    result = empty_result()
+    text_parts = []
+    stripped_depth = 0
+    open_anchors = []
+    headings = []  # [tag, text parts] for h1/h2/title being read
+    h1_found = False
+
+    def add_text(text):
+        if not text:
+            return
+        for anchor in open_anchors:
+            anchor[1].append(text)
+        if not stripped_depth:
+            text_parts.append(text)
+            for heading in headings:
+                heading[1].append(text)
+
+    for event, element in lxml.etree.iterwalk(root, events=('start', 'end', 'comment', 'pi')):
+        if event in ('comment', 'pi'):
+            # Comments and processing instructions only contribute their tail
+            add_text(element.tail)
+            continue
+
+        tag = element.tag if isinstance(element.tag, str) else None
+
+        if event == 'start':
+            if tag in STRIPPED_TAGS:
+                stripped_depth += 1
+            elif tag == 'a' and element.get('href') is not None:
+                open_anchors.append([element.get('href'), []])
+            elif tag == 'meta' and not result['description'] and element.get('name') == 'description':
+                result['description'] = (element.get('content') or '').strip()
+            elif tag == 'link' and result['canonical'] is None and element.get('href') is not None:
+                if 'canonical' in (element.get('rel') or '').lower().split():
+                    result['canonical'] = element.get('href')
+
+            if (tag == 'title' and not result['title']) or (
+                    tag in ('h1', 'h2') and not stripped_depth and not (tag == 'h1' and h1_found)):
+                headings.append([tag, []])
+                if tag == 'h1':
+                    h1_found = True
+
+            add_text(element.text)
+            continue
+
+        if tag is not None:
+            if tag in STRIPPED_TAGS:
+                stripped_depth -= 1
+            elif tag == 'a' and open_anchors and element.get('href') is not None:
+                href, parts = open_anchors.pop()
+                result['links'].append((href, ''.join(parts)))
+
+            if headings and headings[-1][0] == tag:
+                heading_tag, parts = headings.pop()
+                text = ''.join(parts).strip()
+                if heading_tag == 'h2':
+                    result['h2s'].append(text)
+                elif heading_tag == 'h1':
+                    result['h1'] = text
+                elif not result['title']:
+                    result['title'] = text
+
+        add_text(element.tail)
+
+    result['content'] = clean_text(''.join(text_parts))
+    return result
+
+def parse_with_selectolax(html):
+    """Extract page data with selectolax's Lexbor engine, all in C"""
+    tree = LexborHTMLParser(html)
+    result = empty_result()
+
+    for a_tag in tree.css('a[href]'):
+        result['links'].append((a_tag.attributes.get('href') or '', a_tag.text(deep=True)))
+
+    title_tag = tree.css_first('title')
+    if title_tag:
+        result['title'] = title_tag.text(deep=True).strip()
+
+    meta_desc = tree.css_first('meta[name="description"]')
+    if meta_desc:
+        result['description'] = (meta_desc.attributes.get('content') or '').strip()
+
+    canonical_tag = tree.css_first('link[rel~="canonical" i][href]')
+    if canonical_tag:
+        result['canonical'] = canonical_tag.attributes.get('href')
+
+    tree.strip_tags(list(STRIPPED_TAGS))
+
+    h1_tag = tree.css_first('h1')
+    if h1_tag:
+        result['h1'] = h1_tag.text(deep=True).strip()
+
+    result['h2s'] = [h2.text(deep=True).strip() for h2 in tree.css('h2')]
+
+    if tree.root is not None:
+        result['content'] = clean_text(tree.root.text(deep=True))
+    return result
+
+def links_with_bs4(html):
+    """Extract links, title and canonical, building soup for only those tags"""
+    soup = BeautifulSoup(html, 'html.parser', parse_only=SoupStrainer(['a', 'title', 'link']))
+    result = empty_result()
+
+    for a_tag in soup.find_all('a', href=True):
+        result['links'].append((a_tag.get('href', ''), a_tag.get_text()))
+
+    title_tag = soup.find('title')
+    if title_tag:
+        result['title'] = title_tag.get_text().strip()
+
+    for link_tag in soup.find_all('link', href=True):
+        if 'canonical' in (rel.lower() for rel in link_tag.get('rel', [])):
+            result['canonical'] = link_tag['href']
+            break
+    return result
+
+def links_with_lxml(html):
+    """Extract links, title and canonical, letting lxml find the elements in C"""
+    if isinstance(html, str):
+        html = html.encode('utf-8')
+
+    try:
+        root = lxml.html.document_fromstring(html, parser=lxml.html.HTMLParser(encoding='utf-8'))
+    except (lxml.etree.ParserError, ValueError):
+        return empty_result()
+
+    result = empty_result()
+    for element in root.iter('a', 'title', 'link'):
+        if element.tag == 'a':
+            if element.get('href') is not None:
+                text = lxml.etree.tostring(element, method='text', encoding='unicode', with_tail=False)
+                result['links'].append((element.get('href'), text))
+        elif element.tag == 'title':
+            if not result['title']:
+                result['title'] = lxml.etree.tostring(element, method='text', encoding='unicode', with_tail=False).strip()
+        elif result['canonical'] is None and element.get('href') is not None:
+            if 'canonical' in (element.get('rel') or '').lower().split():
+                result['canonical'] = element.get('href')
+    return result
+
+def links_with_selectolax(html):
+    """Extract links, title and canonical with selectolax, skipping the text"""
+    tree = LexborHTMLParser(html)
+    result = empty_result()
+
+    for a_tag in tree.css('a[href]'):
+        result['links'].append((a_tag.attributes.get('href') or '', a_tag.text(deep=True)))
+
+    title_tag = tree.css_first('title')
+    if title_tag:
+        result['title'] = title_tag.text(deep=True).strip()
+
+    canonical_tag = tree.css_first('link[rel~="canonical" i][href]')
+    if canonical_tag:
+        result['canonical'] = canonical_tag.attributes.get('href')
+    return result
+
+BACKENDS = {
+    'html.parser': parse_with_bs4,
+    'lxml': parse_with_lxml,
+    'selectolax': parse_with_selectolax
+}
+
+LINK_BACKENDS = {
+    'html.parser': links_with_bs4,
+    'lxml': links_with_lxml,
+    'selectolax': links_with_selectolax
+}
+
+def available_backends():
+    """List the parser backends that can be used in this environment"""
+    backends = ['html.parser']
+    if lxml is not None:
+        backends.append('lxml')
+    if LexborHTMLParser is not None:
+        backends.append('selectolax')
+    return backends
+
+def resolve_backend(name='auto'):
+    """Map a backend name to an installed backend, preferring the fastest"""
+    available = available_backends()
+    if name == 'auto':
+        return available[-1]
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown parser backend: {name}")
+    if name not in available:
+        logger.warning(f"Parser backend {name} is not installed, falling back to html.parser")
+        return 'html.parser'
+    return name
+
+def parse_html(html, backend='html.parser'):
+    """Extract title, description, headings, content and raw links from HTML
+
+    Links are returned as (href, anchor text) pairs and the canonical as
+    the raw href; both still need to be resolved against the page URL.
+    """
+    return BACKENDS[backend](html)
+
+def parse_links(html, backend='html.parser'):
+    """Extract only the title, canonical and raw links from HTML
+
+    For link-graph crawls: the other fields of the parse_html result are
+    left empty and no page text is extracted.
+    """
+    return LINK_BACKENDS[backend](html)
@@ -0,0 +1,314 @@
+import email.utils
+import random
+import socket
+import threading
+import time
+import urllib.parse
+from datetime import datetime, timezone
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Only advertise brotli when requests can actually decode it
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = 'gzip, deflate, br'
+    except ImportError:
+        ACCEPT_ENCODING = 'gzip, deflate'
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Connection timings of the request running in each thread
+_timings = threading.local()
+
+def _record_timing(stage, seconds):
+    stages = getattr(_timings, 'stages', None)
+    if stages is not None:
+        stages[stage] = stages.get(stage, 0) + seconds
+
+class TimedConnectionMixin:
+    """Report how long new connections spend in DNS and in connecting (TCP and TLS)"""
+
+    dns_seconds = 0
+
+    def _new_conn(self):
+        # Resolve here, where it can be timed, then connect to each address in turn
+        started = time.monotonic()
+        try:
+            infos = socket.getaddrinfo(self._dns_host, self.port, 0, socket.SOCK_STREAM)
+        except (socket.gaierror, UnicodeError):
+            # Let urllib3 raise its usual error
+            return super()._new_conn()
+        finally:
+            self.dns_seconds = time.monotonic() - started
+            _record_timing('dns', self.dns_seconds)
+
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        if not addresses:
+            return super()._new_conn()
+
+        # SNI and certificate checks use self.host, so this only changes where we connect
+        dns_host = self._dns_host
+        try:
+            for index, address in enumerate(addresses):
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except (NewConnectionError, ConnectTimeoutError):
+                    if index == len(addresses) - 1:
+                        raise
+        finally:
+            self._dns_host = dns_host
+
+    def connect(self):
+        started = time.monotonic()
+        self.dns_seconds = 0
+        try:
+            super().connect()
+        finally:
+            _record_timing('connect', time.monotonic() - started - self.dns_seconds)
+
+class TimedHTTPConnection(TimedConnectionMixin, HTTPConnection):
+    pass
+
+class TimedHTTPSConnection(TimedConnectionMixin, HTTPSConnection):
+    pass
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections report DNS and connect times"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool
+        }
+
+def read_limited(response, max_bytes, chunk_size=65536):
+    """Read a streamed response body, giving up once it passes max_bytes
+
+    Returns the body, or None when it was too large (the connection is
+    closed rather than drained).
+    """
+    chunks = []
+    size = 0
+    for chunk in response.iter_content(chunk_size):
+        size += len(chunk)
+        if max_bytes and size > max_bytes:
+            response.close()
+            return None
+        chunks.append(chunk)
+    return b''.join(chunks)
+
+class CircuitOpenError(requests.RequestException):
+    """Raised when a host's circuit breaker is refusing requests"""
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=5, reset_timeout=30, max_trials=3):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_trials = max_trials
+        self.failures = {}
+        self.failed_trials = {}
+        self.opened_at = {}
+        self.trial_running = {}  # host -> thread sending the trial request
+        self.lock = threading.Lock()
+
+    def allow(self, host):
+        """Check if a request to the host may go out"""
+        with self.lock:
+            opened_at = self.opened_at.get(host)
+            if opened_at is None:
+                return True
+            if self._given_up(host):
+                return False
+
+            # After the cool-down let a single trial request through
+            if time.monotonic() - opened_at >= self.reset_timeout and host not in self.trial_running:
+                self.trial_running[host] = threading.get_ident()
+                return True
+
+            return False
+
+    def blocked(self, host):
+        """Check if requests to the host would be refused now, without starting a trial"""
+        with self.lock:
+            opened_at = self.opened_at.get(host)
+            if opened_at is None:
+                return False
+            return (self._given_up(host) or host in self.trial_running
+                    or time.monotonic() - opened_at < self.reset_timeout)
+
+    def given_up(self, host):
+        """Check if the host failed max_trials trial requests in a row and gets no more requests"""
+        with self.lock:
+            return self._given_up(host)
+
+    def _given_up(self, host):
+        return self.max_trials is not None and self.failed_trials.get(host, 0) >= self.max_trials
+
+    def retry_in(self, host):
+        """Seconds until the host's next trial request may go out"""
+        with self.lock:
+            opened_at = self.opened_at.get(host)
+            if opened_at is None:
+                return 0.0
+            return max(0.0, opened_at + self.reset_timeout - time.monotonic())
+
+    def end_trial(self, host):
+        """Let another trial through if this thread's trial ended without a verdict"""
+        with self.lock:
+            if self.trial_running.get(host) == threading.get_ident():
+                del self.trial_running[host]
+
+    def record_success(self, host):
+        """Close the circuit after a successful request"""
+        with self.lock:
+            self.failures.pop(host, None)
+            self.failed_trials.pop(host, None)
+            self.opened_at.pop(host, None)
+            self.trial_running.pop(host, None)
+
+    def record_failure(self, host):
+        """Count a failure and open the circuit once the threshold is hit"""
+        with self.lock:
+            self.failures[host] = self.failures.get(host, 0) + 1
+            if host in self.trial_running:
+                self.failed_trials[host] = self.failed_trials.get(host, 0) + 1
+                if self._given_up(host):
+                    logger.warning(f"Giving up on {host} after {self.failed_trials[host]} failed trial requests")
+            if host in self.trial_running or self.failures[host] >= self.failure_threshold:
+                if host not in self.opened_at:
+                    logger.warning(f"Circuit opened for {host} after {self.failures[host]} failures")
+                self.opened_at[host] = time.monotonic()
+                self.trial_running.pop(host, None)
+
+    def is_open(self, host):
+        """Check if the host is currently being skipped"""
+        with self.lock:
+            return host in self.opened_at
+
+    def reset(self):
+        """Close every circuit, e.g. for a new crawl"""
+        with self.lock:
+            self.failures.clear()
+            self.failed_trials.clear()
+            self.opened_at.clear()
+            self.trial_running.clear()
+
+class HttpClient:
+    def __init__(self, headers=None, pool_size=10, timeout=10, max_retries=3,
+                 backoff_factor=0.5, max_backoff=60, failure_threshold=5, reset_timeout=30, max_trials=3):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout, max_trials)
+
+        # One keep-alive pool per host, sized for the crawl's concurrency
+        self.session = requests.Session()
+        adapter = TimedHTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'Accept-Encoding': ACCEPT_ENCODING})
+        if headers:
+            self.session.headers.update(headers)
+
+    def backoff(self, attempt):
+        """Exponential backoff with jitter for the given retry attempt"""
+        delay = self.backoff_factor * (2 ** attempt)
+        return min(self.max_backoff, delay * random.uniform(0.5, 1.5))
+
+    def retry_after(self, response):
+        """Parse the Retry-After header in seconds, if present"""
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+
+        try:
+            retry_at = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def get(self, url, **kwargs):
+        """GET a URL, retrying transient failures with backoff"""
+        return self.request('GET', url, **kwargs)
+
+    def head(self, url, **kwargs):
+        """HEAD a URL, retrying transient failures with backoff"""
+        return self.request('HEAD', url, **kwargs)
+
+    def request(self, method, url, **kwargs):
+        """Send a request, retrying transient failures with backoff"""
+        host = urllib.parse.urlparse(url).netloc
+        kwargs.setdefault('timeout', self.timeout)
+        _timings.stages = {}
+
+        # A trial request that ends in any other exception must not block the host for good
+        try:
+            for attempt in range(self.max_retries + 1):
+                if not self.breaker.allow(host):
+                    raise CircuitOpenError(f"Circuit open for {host}")
+
+                try:
+                    response = self.session.request(method, url, **kwargs)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    self.breaker.record_failure(host)
+                    if attempt == self.max_retries or self.breaker.is_open(host):
+                        raise
+                    delay = self.backoff(attempt)
+                    logger.info(f"Retrying {url} in {delay:.1f}s ({e.__class__.__name__})")
+                    time.sleep(delay)
+                    continue
+
+                if response.status_code in RETRY_STATUSES:
+                    self.breaker.record_failure(host)
+                    if attempt == self.max_retries or self.breaker.is_open(host):
+                        return response
+
+                    retry_after = self.retry_after(response)
+                    delay = min(self.max_backoff, retry_after if retry_after is not None else self.backoff(attempt))
+                    logger.info(f"Retrying {url} in {delay:.1f}s (HTTP {response.status_code})")
+                    response.close()
+                    time.sleep(delay)
+                    continue
+
+                self.breaker.record_success(host)
+                return response
+        finally:
+            self.breaker.end_trial(host)
+
+    def last_timings(self):
+        """Get the DNS and connect seconds of this thread's last request
+
+        Both are missing when the request reused a pooled connection.
+        """
+        return dict(getattr(_timings, 'stages', None) or {})
+
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
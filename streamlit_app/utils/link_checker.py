@@ -0,0 +1,148 @@
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import requests
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+class LinkChecker:
+    """Resolve link targets to their final status, following redirects hop by hop
+
+    Every hop is a HEAD request, repeated as a GET (without reading the
+    body) when HEAD fails or returns an error, since some servers mishandle
+    HEAD. Results are cached per URL, and each URL along a redirect chain
+    gets its own result, so chains shared by many links are walked once.
+
+    A result holds the final status (None when no response came back), the
+    final URL, the number of redirects, the chain of URLs that redirected,
+    and an error message for failed requests, loops and overlong chains.
+    """
+
+    def __init__(self, client, throttle=None, allowed=None, concurrency=8, max_redirects=10):
+        self.client = client
+        self.throttle = throttle
+        self.allowed = allowed
+        self.concurrency = max(1, concurrency)
+        self.max_redirects = max_redirects
+        self.results = {}
+        self.lock = threading.Lock()
+
+    def check(self, url):
+        """Get the result for a URL, resolving it unless it is cached"""
+        result = self.results.get(url)
+        if result is None:
+            result = self._resolve(url)
+        return result
+
+    def check_all(self, urls):
+        """Resolve the URLs that are not cached yet, concurrently; returns {url: result}"""
+        urls = list(dict.fromkeys(urls))
+        unchecked = [url for url in urls if url not in self.results]
+        if unchecked:
+            logger.info(f"Checking {len(unchecked)} link targets ({self.concurrency} threads)")
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                for _ in executor.map(self.check, unchecked):
+                    pass
+        return {url: self.results[url] for url in urls}
+
+    def _resolve(self, url):
+        chain = []
+        status, error = None, None
+        chain_failed = False
+        current = url
+        while True:
+            cached = self.results.get(current)
+            if cached is not None:
+                # Join a chain that was already walked
+                status, error = cached['status'], cached['error']
+                chain.extend(cached['redirect_chain'])
+                current = cached['final_url']
+                break
+
+            if current in chain or len(chain) > self.max_redirects:
+                error = 'redirect loop' if current in chain else f"more than {self.max_redirects} redirects"
+                chain_failed = True
+                break
+
+            status, location, error = self._request(current)
+            if status not in REDIRECT_STATUSES or not location:
+                break
+            chain.append(current)
+            current = urllib.parse.urljoin(current, location)
+
+        # Cache every URL on the chain with the rest of the chain from there,
+        # unless the chain as a whole failed (a loop or too many redirects)
+        hops = [url] if chain_failed else chain + [current]
+        with self.lock:
+            for index, hop in enumerate(hops):
+                self.results.setdefault(hop, {
+                    'status': status,
+                    'final_url': current,
+                    'redirects': len(chain) - index,
+                    'redirect_chain': chain[index:],
+                    'error': error
+                })
+            return self.results[url]
+
+    def _request(self, url):
+        """Request a single hop as (status, Location header, error)"""
+        if self.allowed is not None and not self.allowed(url):
+            return None, None, 'disallowed by robots.txt'
+
+        host = urllib.parse.urlparse(url).netloc
+        status, location, error = None, None, None
+        for method in (self.client.head, self.client.get):
+            if self.throttle is not None:
+                self.throttle.wait(host)
+            try:
+                response = method(url, allow_redirects=False, stream=True)
+            except requests.RequestException as e:
+                status, location, error = None, None, str(e)
+                continue
+            response.close()
+            status, location, error = response.status_code, response.headers.get('Location'), None
+            if status < 400:
+                break
+        return status, location, error
+
+    def annotate(self, links_df):
+        """Add the results for each link's target as target_* columns
+
+        Targets that have not been checked get missing values. The columns
+        are built per distinct target and then spread over the links.
+        """
+        targets = links_df['target_url']
+        if isinstance(targets.dtype, pd.CategoricalDtype):
+            codes, urls = targets.cat.codes.to_numpy(), targets.cat.categories
+        else:
+            codes, urls = pd.factorize(targets)
+
+        results = [self.results.get(url) for url in urls]
+        statuses = pd.array([result['status'] if result else None for result in results], dtype='Int64')
+        redirects = pd.array([result['redirects'] if result else None for result in results], dtype='Int64')
+        final_urls = pd.Categorical([result['final_url'] if result else None for result in results])
+        errors = pd.Categorical([result['error'] if result else None for result in results])
+
+        links_df = links_df.copy()
+        links_df['target_status'] = statuses.take(codes, allow_fill=True)
+        links_df['target_redirects'] = redirects.take(codes, allow_fill=True)
+        links_df['target_final_url'] = final_urls.take(codes, allow_fill=True)
+        links_df['target_error'] = errors.take(codes, allow_fill=True)
+        return links_df
+
+    def to_df(self, urls=None):
+        """One row per checked URL (or per given URL) with its result"""
+        urls = list(self.results) if urls is None else list(urls)
+        rows = []
+        for url in urls:
+            result = self.results.get(url)
+            if result is not None:
+                rows.append(dict(result, url=url, redirect_chain=' -> '.join(result['redirect_chain'])))
+        columns = ['url', 'status', 'final_url', 'redirects', 'redirect_chain', 'error']
+        return pd.DataFrame(rows, columns=columns)
@@ -0,0 +1,167 @@
+import itertools
+from array import array
+import numpy as np
+import pandas as pd
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+class LinkGraph:
+    """The crawl's links as interned IDs in typed arrays
+
+    Every URL and anchor text is stored once and referred to by its ID,
+    so a link costs 16 bytes (source, target, anchor and count) instead of
+    a dict of three strings. Repeated links from a page to the same target
+    are stored once with a count and the first anchor text; the anchors of
+    repeats are only kept (in repeat_anchors) when they differ.
+    """
+
+    def __init__(self):
+        self.url_ids = {}
+        self.urls = []
+        self.anchor_ids = {}
+        self.anchors = []
+        self.sources = array('i')
+        self.targets = array('i')
+        self.anchor_refs = array('i')
+        self.counts = array('i')
+
+        # Edge -> anchor IDs of its repeats, for edges whose repeats change the anchor
+        self.repeat_anchors = {}
+
+        # Page i's links are the edges from page_starts[i] to page_starts[i + 1]
+        self.page_starts = array('q', [0])
+
+    def __len__(self):
+        """Number of distinct source -> target edges"""
+        return len(self.sources)
+
+    def url_id(self, url):
+        """Get the ID of a URL, adding it to the URL table if it is new"""
+        url_id = self.url_ids.get(url)
+        if url_id is None:
+            url_id = self.url_ids[url] = len(self.urls)
+            self.urls.append(url)
+        return url_id
+
+    def _anchor_id(self, text):
+        anchor_id = self.anchor_ids.get(text)
+        if anchor_id is None:
+            anchor_id = self.anchor_ids[text] = len(self.anchors)
+            self.anchors.append(text)
+        return anchor_id
+
+    def add_page(self, page):
+        """Store a page's links; returns the page's index in the graph"""
+        source = self.url_id(page['url'])
+        first_edge = {}
+        for link in page['links']:
+            target = self.url_id(link['url'])
+            anchor = self._anchor_id(link['text'])
+            edge = first_edge.get(target)
+            if edge is None:
+                first_edge[target] = len(self.sources)
+                self.sources.append(source)
+                self.targets.append(target)
+                self.anchor_refs.append(anchor)
+                self.counts.append(1)
+                continue
+
+            repeats = self.repeat_anchors.get(edge)
+            if repeats is None and anchor != self.anchor_refs[edge]:
+                # Earlier repeats all had the first anchor
+                repeats = self.repeat_anchors[edge] = array('i', [self.anchor_refs[edge]] * (self.counts[edge] - 1))
+            if repeats is not None:
+                repeats.append(anchor)
+            self.counts[edge] += 1
+
+        self.page_starts.append(len(self.sources))
+        return len(self.page_starts) - 2
+
+    def page_links(self, index):
+        """Rebuild a page's link records with their anchor texts
+
+        Repeats of a link follow its first occurrence rather than keeping
+        their place on the page.
+        """
+        urls = self.urls
+        links = []
+        for edge in range(self.page_starts[index], self.page_starts[index + 1]):
+            url, source_url = urls[self.targets[edge]], urls[self.sources[edge]]
+            repeats = self.repeat_anchors.get(edge, [self.anchor_refs[edge]] * (self.counts[edge] - 1))
+            for anchor in itertools.chain([self.anchor_refs[edge]], repeats):
+                links.append({'url': url, 'text': self.anchors[anchor], 'source_url': source_url})
+        return links
+
+    def outgoing_counts(self):
+        """Number of links on each page, including repeats, in page order"""
+        totals = np.concatenate(([0], np.cumsum(np.frombuffer(self.counts, dtype=np.int32), dtype=np.int64)))
+        starts = np.frombuffer(self.page_starts, dtype=np.int64)
+        return totals[starts[1:]] - totals[starts[:-1]]
+
+    def target_urls(self):
+        """Distinct link targets, in the order they were first seen"""
+        return [self.urls[url_id] for url_id in np.unique(np.frombuffer(self.targets, dtype=np.int32))]
+
+    def link_count(self):
+        """Number of links including repeats"""
+        return sum(self.counts)
+
+    def to_df(self):
+        """Build the links DataFrame straight from the arrays
+
+        URL and anchor columns are categoricals over the URL and anchor
+        tables, so no per-link Python objects are created.
+        """
+        urls = pd.Index(self.urls, dtype=object)
+        return pd.DataFrame({
+            'source_url': pd.Categorical.from_codes(np.frombuffer(self.sources, dtype=np.int32).copy(), categories=urls),
+            'target_url': pd.Categorical.from_codes(np.frombuffer(self.targets, dtype=np.int32).copy(), categories=urls),
+            'anchor_text': pd.Categorical.from_codes(
+                np.frombuffer(self.anchor_refs, dtype=np.int32).copy(),
+                categories=pd.Index(self.anchors, dtype=object)
+            ),
+            'count': np.frombuffer(self.counts, dtype=np.int32).copy()
+        })
+
+class PageList:
+    """The crawled page records, with each page's links rebuilt from the link graph when read
+
+    Records are stored without their links, which live in the graph, so
+    crawler.pages keeps the shape of a list of page dicts with 'links'
+    without holding per-link dicts in memory.
+    """
+
+    def __init__(self, link_graph):
+        self.link_graph = link_graph
+        self.records = []
+
+    def append(self, page):
+        """Add a page whose links are already in the link graph"""
+        self.records.append({key: value for key, value in page.items() if key != 'links'})
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.records)))]
+        if index < 0:
+            index += len(self.records)
+        return dict(self.records[index], links=self.link_graph.page_links(index))
+
+    def __iter__(self):
+        for index in range(len(self.records)):
+            yield self[index]
+
+def link_counts(links_df):
+    """Get how many links each row of a links DataFrame stands for
+
+    Crawled links have one row per source -> target pair with a count;
+    simulated links, and links loaded from older CSV files, have a row per link.
+    """
+    if 'count' in links_df:
+        return links_df['count']
+    return pd.Series(1, index=links_df.index)
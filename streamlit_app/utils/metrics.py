@@ -0,0 +1,155 @@
+import json
+import threading
+import time
+from collections import Counter, deque
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Where the time for one page goes, in the order it is spent
+STAGES = ('robots', 'politeness', 'dns', 'connect', 'response', 'download', 'parse')
+
+class CrawlMetrics:
+    """Thread-safe counters and stage timings for one crawl
+
+    Fetch workers record stages as they happen; the crawl loop records
+    parse times, pages and queue depth samples.
+    """
+
+    def __init__(self, max_samples=3600, sample_interval=1.0):
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.finished = None
+        self.sample_interval = sample_interval
+        self.stage_counts = Counter()
+        self.stage_totals = Counter()
+        self.stage_max = {}
+        self.statuses = Counter()
+        self.skips = Counter()
+        self.bytes = 0
+        self.pages = 0
+        self.queue_samples = deque(maxlen=max_samples)
+        self.last_sample = None
+
+    def record_stage(self, stage, seconds):
+        """Add the time one request spent in a stage"""
+        with self.lock:
+            self.stage_counts[stage] += 1
+            self.stage_totals[stage] += seconds
+            if seconds > self.stage_max.get(stage, 0):
+                self.stage_max[stage] = seconds
+
+    def record_timings(self, timings):
+        """Add a page's {stage: seconds} timings"""
+        for stage, seconds in timings.items():
+            self.record_stage(stage, seconds)
+
+    def record_response(self, status):
+        """Count a response by status code, or 'error' when there was none"""
+        with self.lock:
+            self.statuses[str(status)] += 1
+
+    def record_bytes(self, size):
+        with self.lock:
+            self.bytes += size
+
+    def record_skip(self, reason):
+        with self.lock:
+            self.skips[reason] += 1
+
+    def record_page(self):
+        with self.lock:
+            self.pages += 1
+
+    def sample_queue(self, depth, force=False):
+        """Remember the frontier size, at most once per sample_interval"""
+        now = time.monotonic()
+        if not force and self.last_sample is not None and now - self.last_sample < self.sample_interval:
+            return
+        self.last_sample = now
+        with self.lock:
+            self.queue_samples.append((round(now - self.started, 3), depth, self.pages))
+
+    def finish(self):
+        self.finished = time.monotonic()
+
+    def elapsed(self):
+        return (self.finished or time.monotonic()) - self.started
+
+    def pages_per_second(self):
+        elapsed = self.elapsed()
+        return self.pages / elapsed if elapsed > 0 else 0.0
+
+    def to_dict(self):
+        """Get all metrics as plain JSON-serializable data"""
+        with self.lock:
+            stages = {
+                stage: {
+                    'count': self.stage_counts[stage],
+                    'total_seconds': self.stage_totals[stage],
+                    'mean_seconds': self.stage_totals[stage] / self.stage_counts[stage],
+                    'max_seconds': self.stage_max.get(stage, 0)
+                }
+                for stage in sorted(self.stage_counts, key=lambda s: STAGES.index(s) if s in STAGES else len(STAGES))
+            }
+            return {
+                'elapsed_seconds': self.elapsed(),
+                'pages': self.pages,
+                'pages_per_second': self.pages_per_second(),
+                'bytes': self.bytes,
+                'statuses': dict(self.statuses),
+                'skips': dict(self.skips),
+                'stages': stages,
+                'queue_depth': [
+                    {'elapsed_seconds': elapsed, 'depth': depth, 'pages': pages}
+                    for elapsed, depth, pages in self.queue_samples
+                ]
+            }
+
+    def to_json(self, path=None):
+        """Serialize the metrics as JSON, also writing them to path if given"""
+        data = json.dumps(self.to_dict(), indent=2)
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(data)
+        return data
+
+    def to_prometheus(self, prefix='crawler'):
+        """Render the metrics in the Prometheus text exposition format"""
+        data = self.to_dict()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            # Samples are (name suffix, labels, value), e.g. '_sum' for summaries
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for suffix, labels, value in samples:
+                label_text = ','.join(f'{key}="{label}"' for key, label in labels.items())
+                label_text = f"{{{label_text}}}" if label_text else ''
+                lines.append(f"{prefix}_{name}{suffix}{label_text} {value}")
+
+        stages = data['stages']
+        metric('stage_seconds', 'summary', 'Time spent in each crawl stage.', [
+            sample
+            for stage, values in stages.items()
+            for sample in (('_sum', {'stage': stage}, values['total_seconds']),
+                           ('_count', {'stage': stage}, values['count']))
+        ])
+        metric('stage_seconds_max', 'gauge', 'Slowest single request in each crawl stage.', [
+            ('', {'stage': stage}, values['max_seconds']) for stage, values in stages.items()
+        ])
+        metric('responses_total', 'counter', 'Responses by HTTP status code.', [
+            ('', {'status': status}, count) for status, count in sorted(data['statuses'].items())
+        ])
+        metric('skipped_total', 'counter', 'URLs that produced no page, by reason.', [
+            ('', {'reason': reason}, count) for reason, count in sorted(data['skips'].items())
+        ])
+        metric('bytes_total', 'counter', 'Response bytes received.', [('', {}, data['bytes'])])
+        metric('pages_total', 'counter', 'Pages added to the crawl.', [('', {}, data['pages'])])
+        metric('pages_per_second', 'gauge', 'Average crawl rate.', [('', {}, round(data['pages_per_second'], 6))])
+        if data['queue_depth']:
+            metric('queue_depth', 'gauge', 'URLs waiting in the frontier.', [('', {}, data['queue_depth'][-1]['depth'])])
+
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,195 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.parse
+from urllib.robotparser import RobotFileParser
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def parse_crawl_delay(text, user_agent):
+    """Find the Crawl-delay for a user agent, allowing fractional values
+
+    RobotFileParser only understands whole seconds.
+    """
+    name = user_agent.split('/')[0].lower()
+    delays = {}
+    agents = []
+    in_rules = False
+
+    for line in text.splitlines():
+        line = line.split('#', 1)[0].strip()
+        if ':' not in line:
+            continue
+        field, value = (part.strip() for part in line.split(':', 1))
+        field = field.lower()
+
+        if field == 'user-agent':
+            # A user-agent line after rules starts a new group
+            if in_rules:
+                agents, in_rules = [], False
+            agents.append(value.lower())
+        elif field == 'crawl-delay':
+            in_rules = True
+            try:
+                delay = float(value)
+            except ValueError:
+                continue
+            for agent in agents:
+                delays.setdefault(agent, delay)
+        else:
+            in_rules = True
+
+    for agent, delay in delays.items():
+        if agent != '*' and agent in name:
+            return delay
+    return delays.get('*')
+
+class RobotsCache:
+    """robots.txt rules fetched through the crawler's HTTP client and cached on disk
+
+    Server errors and network failures disallow the whole host for
+    error_ttl seconds, after which robots.txt is fetched again; they are
+    never written to the disk cache.
+    """
+
+    def __init__(self, client, user_agent, cache_dir=None, ttl=86400, timeout=5, on_load=None, error_ttl=60):
+        self.client = client
+        self.user_agent = user_agent
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.timeout = timeout
+        self.on_load = on_load
+        self.error_ttl = error_ttl
+        self.parsers = {}
+        self.retry_at = {}  # base URL -> when a failed fetch is retried
+        self.crawl_delays = {}
+        self.host_locks = {}
+        self.lock = threading.Lock()
+
+    def _base_url(self, url):
+        parsed = urllib.parse.urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc}"
+
+    def _cache_path(self, base_url):
+        name = hashlib.sha1(base_url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{name}.json")
+
+    def _read_cache(self, base_url):
+        """Get the cached (status, text) for a host if it is still fresh"""
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._cache_path(base_url), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get('fetched_at', 0) > self.ttl:
+            return None
+        if self._failed(entry['status']):
+            return None
+        return entry['status'], entry['text']
+
+    def _write_cache(self, base_url, status, text):
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._cache_path(base_url)
+            with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+                json.dump({'url': base_url, 'fetched_at': time.time(), 'status': status, 'text': text}, f)
+            os.replace(f"{path}.tmp", path)
+        except OSError as e:
+            logger.warning(f"Error caching robots.txt for {base_url}: {e}")
+
+    def _failed(self, status):
+        """Check if a fetch failed in a way that may pass, i.e. a network or server error"""
+        return status is None or status >= 500
+
+    def _fetch(self, base_url):
+        """Download robots.txt as (status, text); the status is None after a network error"""
+        try:
+            response = self.client.get(f"{base_url}/robots.txt", timeout=self.timeout)
+        except Exception as e:
+            logger.warning(f"Error reading robots.txt for {base_url}: {e}")
+            return None, ''
+        return response.status_code, response.text if response.status_code == 200 else ''
+
+    def _build_parser(self, base_url, status, text):
+        # As RobotFileParser.read(), which also disallows everything after a
+        # server error, and network errors are treated the same way
+        parser = RobotFileParser(f"{base_url}/robots.txt")
+        if status in (401, 403) or self._failed(status):
+            parser.disallow_all = True
+        elif status >= 400:
+            parser.allow_all = True
+        else:
+            parser.parse(text.splitlines())
+        return parser
+
+    def get(self, url):
+        """Get the robots.txt parser for the URL's host"""
+        base_url = self._base_url(url)
+        parser = self.parsers.get(base_url)
+        if parser is not None and not self._retry_due(base_url):
+            return parser
+
+        # Fetch each host's rules once, even with many workers asking at the same time
+        with self.lock:
+            host_lock = self.host_locks.setdefault(base_url, threading.Lock())
+        with host_lock:
+            parser = self.parsers.get(base_url)
+            if parser is not None and not self._retry_due(base_url):
+                return parser
+
+            cached = self._read_cache(base_url)
+            if cached is not None:
+                status, text = cached
+            else:
+                status, text = self._fetch(base_url)
+
+            # Keep failures in memory only, so they are retried soon
+            if self._failed(status):
+                problem = 'is unreachable' if status is None else f"returned HTTP {status}"
+                logger.warning(f"robots.txt for {base_url} {problem}; disallowing the host for {self.error_ttl}s")
+                self.retry_at[base_url] = time.monotonic() + self.error_ttl
+            else:
+                self.retry_at.pop(base_url, None)
+                if cached is None:
+                    self._write_cache(base_url, status, text)
+
+            parser = self._build_parser(base_url, status, text)
+            self.crawl_delays[base_url] = parse_crawl_delay(text, self.user_agent)
+            self.parsers[base_url] = parser
+
+        if self.on_load:
+            self.on_load(base_url, parser)
+        return parser
+
+    def _retry_due(self, base_url):
+        retry_at = self.retry_at.get(base_url)
+        return retry_at is not None and time.monotonic() >= retry_at
+
+    def can_fetch(self, url):
+        """Check if robots.txt allows the crawler to fetch the URL"""
+        return self.get(url).can_fetch(self.user_agent, url)
+
+    def crawl_delay(self, url):
+        """Get the host's Crawl-delay (or Request-rate) in seconds, if any"""
+        parser = self.get(url)
+        delay = self.crawl_delays.get(self._base_url(url))
+        if delay is not None:
+            return delay
+
+        rate = parser.request_rate(self.user_agent)
+        if rate is not None and rate.requests:
+            return rate.seconds / rate.requests
+        return None
+
+    def sitemaps(self, url):
+        """Get the Sitemap: URLs listed in the host's robots.txt"""
+        return self.get(url).site_maps() or []
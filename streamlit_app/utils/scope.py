@@ -0,0 +1,149 @@
+import re
+from collections import Counter, defaultdict
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Query parameters that carry a session ID, making every visit a new URL
+DEFAULT_SESSION_PARAMS = ('jsessionid', 'phpsessid', 'sid', 'sessionid', 'session_id', 'sessid', 'cfid', 'cftoken')
+
+# Inline flags like (?i) that apply to a whole regex
+GLOBAL_FLAGS = re.compile(r'(?:\(\?[aimsux]+\))+')
+
+def compile_pattern(pattern):
+    """Turn a scope pattern into a regex source, raising ValueError if it is invalid
+
+    Patterns starting with 're:' are regexes searched anywhere in the path
+    and query; anything else is a glob that must match all of it, where
+    '*' matches any run of characters (including '/' and '?'). Leading
+    inline flags such as '(?i)' are scoped to the pattern, so it can be
+    combined with others.
+    """
+    if not pattern.startswith('re:'):
+        return '^' + '.*'.join(re.escape(part) for part in pattern.split('*')) + '$'
+
+    try:
+        re.compile(pattern[3:])
+    except re.error as e:
+        raise ValueError(f"Invalid URL pattern {pattern!r}: {e}") from None
+    match = GLOBAL_FLAGS.match(pattern, 3)
+    flags = ''.join(sorted(set(re.sub(r'[()?]', '', match.group())))) if match else ''
+    body = pattern[match.end():] if match else pattern[3:]
+    # A verbose-mode comment would swallow the closing parenthesis
+    return f"(?{flags}:{body}\n)" if 'x' in flags else f"(?{flags}:{body})"
+
+def compile_patterns(patterns):
+    """Compile patterns into a list of regexes that match if any of them does, or None
+
+    Patterns are joined into a single regex where possible. Regexes with
+    capturing groups are kept apart, since joining them would renumber
+    their backreferences.
+    """
+    if not patterns:
+        return None
+    sources = [compile_pattern(pattern) for pattern in patterns]
+    if len(sources) > 1 and not any(re.compile(source).groups for source in sources):
+        return [re.compile('|'.join(sources))]
+    return [re.compile(source) for source in sources]
+
+def split_target(url):
+    """Get the (path, query) of an absolute URL without a full parse"""
+    start = url.find('/', url.find('//') + 2)
+    if start < 0:
+        return '/', ''
+    path, _, query = url[start:].partition('#')[0].partition('?')
+    return path, query
+
+class ScopeRules:
+    """Decide which same-site URLs are worth crawling
+
+    Include and exclude patterns apply to the path and query ('/blog/?page=2'),
+    and each kind is compiled into as few regexes as possible. Invalid
+    patterns raise a ValueError naming the pattern. caps limits how many
+    URLs matching a pattern are queued, e.g. {'/calendar/*': 50}.
+
+    Trap heuristics reject URLs that are too long, carry a session ID,
+    have too many query parameters, repeat a path segment more than
+    max_segment_repeats times (/a/b/a/b/a/b/), or are one of more than
+    max_query_variants query strings on the same path (faceted filters).
+    Set any limit to None to turn it off.
+    """
+
+    def __init__(self, include=(), exclude=(), caps=None, max_url_length=512, max_query_params=6,
+                 max_segment_repeats=2, max_query_variants=100, session_params=DEFAULT_SESSION_PARAMS):
+        self.include = compile_patterns(include)
+        self.exclude = compile_patterns(exclude)
+        self.caps = [(re.compile(compile_pattern(pattern)), limit, pattern) for pattern, limit in (caps or {}).items()]
+        self.max_url_length = max_url_length
+        self.max_query_params = max_query_params
+        self.max_segment_repeats = max_segment_repeats
+        self.max_query_variants = max_query_variants
+        self.session_pattern = None
+        if session_params:
+            names = '|'.join(re.escape(name) for name in session_params)
+            self.session_pattern = re.compile(rf"(?:^|[;&?])(?:{names})=", re.IGNORECASE)
+        self.reset()
+
+    def reset(self):
+        """Forget the counts behind caps and query variants and the rejected URLs, e.g. for a new crawl"""
+        self.cap_counts = [0] * len(self.caps)
+        self.query_variants = defaultdict(int)
+        self.rejected = Counter()
+        self.rejected_urls = set()
+
+    def check(self, url):
+        """Get the reason a URL is out of scope, or None; uses no crawl state"""
+        path, query = split_target(url)
+        return self._check(url, path, query, f"{path}?{query}" if query else path)
+
+    def _check(self, url, path, query, target):
+        if self.max_url_length and len(url) > self.max_url_length:
+            return 'too_long'
+        if self.session_pattern is not None and self.session_pattern.search(target):
+            return 'session_id'
+        if query and self.max_query_params is not None and query.count('&') >= self.max_query_params:
+            return 'query_params'
+        if self.max_segment_repeats is not None:
+            segments = path.strip('/').split('/')
+            if (len(segments) > self.max_segment_repeats and len(set(segments)) < len(segments)
+                    and max(Counter(segments).values()) > self.max_segment_repeats):
+                return 'repeated_segments'
+        if self.exclude is not None and any(regex.search(target) for regex in self.exclude):
+            return 'excluded'
+        if self.include is not None and not any(regex.search(target) for regex in self.include):
+            return 'not_included'
+        return None
+
+    def admit(self, url):
+        """Check a URL about to be queued for the first time, counting it against the caps
+
+        Rejected URLs are remembered, so rejected counts distinct URLs and
+        links to them are not checked again.
+        """
+        if url in self.rejected_urls:
+            return False
+        path, query = split_target(url)
+        target = f"{path}?{query}" if query else path
+        reason = self._check(url, path, query, target)
+
+        if reason is None:
+            matched = [index for index, (pattern, _, _) in enumerate(self.caps) if pattern.search(target)]
+            if any(self.cap_counts[index] >= self.caps[index][1] for index in matched):
+                reason = 'capped'
+            elif query and self.max_query_variants is not None and self.query_variants[path] >= self.max_query_variants:
+                reason = 'query_variants'
+            else:
+                for index in matched:
+                    self.cap_counts[index] += 1
+                if query:
+                    self.query_variants[path] += 1
+
+        if reason is not None:
+            self.rejected_urls.add(url)
+            self.rejected[reason] += 1
+            if self.rejected[reason] == 1:
+                logger.info(f"Out of scope ({reason}): {url}")
+            return False
+        return True
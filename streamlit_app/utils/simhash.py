@@ -0,0 +1,74 @@
+import hashlib
+import re
+import numpy as np
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+WORD_PATTERN = re.compile(r'\w+')
+BIT_WEIGHTS = np.uint64(1) << np.arange(64, dtype=np.uint64)
+
+def _hash64(feature):
+    # Stable across processes, unlike hash()
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little')
+
+def simhash(text, shingle_size=3):
+    """64-bit SimHash of a text's word shingles
+
+    Texts that share most of their shingles get fingerprints that differ
+    in only a few bits.
+    """
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) >= shingle_size:
+        features = [' '.join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)]
+    else:
+        features = [' '.join(words)] if words else []
+    if not features:
+        return 0
+
+    # Each feature votes +1/-1 for every bit of its hash
+    hashes = np.fromiter((_hash64(feature) for feature in features), dtype=np.uint64, count=len(features))
+    bits = (hashes[:, None] & BIT_WEIGHTS) != 0
+    votes = 2 * bits.sum(axis=0, dtype=np.int64) - len(features)
+    return int(BIT_WEIGHTS[votes > 0].sum(dtype=np.uint64))
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count('1')
+
+class SimHashIndex:
+    """Find fingerprints within max_distance bits of a new one
+
+    The 64 bits are split into max_distance + 1 blocks. Two fingerprints
+    that differ in at most max_distance bits must agree on at least one
+    whole block, so only fingerprints sharing a block are compared.
+    """
+
+    def __init__(self, max_distance=6):
+        self.max_distance = max_distance
+        blocks = max_distance + 1
+        self.blocks = [(64 * i // blocks, 64 * (i + 1) // blocks) for i in range(blocks)]
+        self.buckets = {}
+        self.size = 0
+
+    def _keys(self, fingerprint):
+        for index, (start, end) in enumerate(self.blocks):
+            yield index, (fingerprint >> start) & ((1 << (end - start)) - 1)
+
+    def find(self, fingerprint):
+        """Get the key of a stored near-duplicate of the fingerprint, or None"""
+        for key in self._keys(fingerprint):
+            for other, value in self.buckets.get(key, ()):
+                if hamming_distance(fingerprint, other) <= self.max_distance:
+                    return value
+        return None
+
+    def add(self, fingerprint, value):
+        """Store a fingerprint under a key, usually the page URL"""
+        for key in self._keys(fingerprint):
+            self.buckets.setdefault(key, []).append((fingerprint, value))
+        self.size += 1
+
+    def __len__(self):
+        return self.size
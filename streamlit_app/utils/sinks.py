@@ -0,0 +1,191 @@
+import json
+import os
+import logging
+
+from utils.metrics import STAGES
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Optional columnar output
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+class JSONLSink:
+    """Append crawled pages to a JSON Lines file in batches"""
+
+    # A resumed crawl can keep adding to the file
+    can_resume = True
+
+    def __init__(self, path, batch_size=100, append=False):
+        self.path = path
+        self.batch_size = batch_size
+        self.append = append
+        self.batch = []
+        self.file = None
+        self.pages_written = 0
+
+    def write(self, page):
+        """Buffer a page, writing the batch out once it is full"""
+        self.batch.append(page)
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write any buffered pages to disk"""
+        if not self.batch:
+            return
+
+        if self.file is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            self.file = open(self.path, 'a' if self.append else 'w', encoding='utf-8')
+
+            # Later batches of the same crawl always append
+            self.append = True
+
+        self.file.write(''.join(json.dumps(page) + '\n' for page in self.batch))
+        self.file.flush()
+        self.pages_written += len(self.batch)
+        self.batch = []
+
+    def close(self):
+        """Flush and close the file"""
+        self.flush()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def reset(self):
+        """Start over for a new crawl: the next write replaces the file"""
+        self.batch = []
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        self.append = False
+        self.pages_written = 0
+
+    def resume(self, pages_written=None):
+        """Continue an interrupted crawl's file: the next write appends
+
+        With pages_written (the count saved with the crawl's checkpoint),
+        pages written after that checkpoint are cut off, since the resumed
+        crawl fetches them again.
+        """
+        self.batch = []
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        self.append = True
+
+        count = 0
+        if os.path.exists(self.path):
+            with open(self.path, 'r+b') as f:
+                for line in iter(f.readline, b''):
+                    if pages_written is not None and count == pages_written:
+                        f.truncate(f.tell() - len(line))
+                        break
+                    if line.strip():
+                        count += 1
+        if pages_written is not None and count < pages_written:
+            logger.warning(f"{self.path} holds {count} pages, but the checkpoint expected {pages_written}")
+        self.pages_written = count
+
+    def iter_pages(self):
+        """Stream the pages written so far"""
+        self.flush()
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+class ParquetSink:
+    """Write crawled pages to a Parquet file, one row group per batch"""
+
+    # Parquet files can't be appended to once closed
+    can_resume = False
+
+    def __init__(self, path, batch_size=1000):
+        if pa is None:
+            raise ImportError("ParquetSink requires pyarrow (pip install pyarrow)")
+
+        self.path = path
+        self.batch_size = batch_size
+        self.batch = []
+        self.writer = None
+        self.pages_written = 0
+        self.schema = pa.schema([
+            ('url', pa.string()),
+            ('fetched_url', pa.string()),
+            ('domain', pa.string()),
+            ('title', pa.string()),
+            ('description', pa.string()),
+            ('h1', pa.string()),
+            ('h2s', pa.list_(pa.string())),
+            ('content', pa.string()),
+            ('links', pa.list_(pa.struct([
+                ('url', pa.string()),
+                ('text', pa.string()),
+                ('source_url', pa.string())
+            ]))),
+            ('depth', pa.int32()),
+            ('crawled_at', pa.string()),
+            ('etag', pa.string()),
+            ('last_modified', pa.string()),
+            ('simhash', pa.uint64()),
+            ('duplicate_of', pa.string()),
+            ('timings', pa.struct([(stage, pa.float64()) for stage in STAGES]))
+        ])
+
+    def write(self, page):
+        """Buffer a page, writing a row group once the batch is full"""
+        self.batch.append(page)
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write any buffered pages as a row group"""
+        if not self.batch:
+            return
+
+        if self.writer is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            self.writer = pq.ParquetWriter(self.path, self.schema)
+
+        columns = {name: [page.get(name) for page in self.batch] for name in self.schema.names}
+        self.writer.write_table(pa.table(columns, schema=self.schema))
+        self.pages_written += len(self.batch)
+        self.batch = []
+
+    def close(self):
+        """Flush and finalize the file; it is only readable after closing"""
+        self.flush()
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    def reset(self):
+        """Start over for a new crawl: the next write replaces the file"""
+        self.batch = []
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        self.pages_written = 0
+
+    def iter_pages(self):
+        """Stream the pages from a closed file, one row group at a time"""
+        if self.writer is not None:
+            raise RuntimeError("Close the ParquetSink before reading it back")
+        if not os.path.exists(self.path):
+            return
+        parquet_file = pq.ParquetFile(self.path)
+        for index in range(parquet_file.num_row_groups):
+            yield from parquet_file.read_row_group(index).to_pylist()
@@ -0,0 +1,149 @@
+import gzip
+import heapq
+import re
+import urllib.parse
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SITEMAP_LINE = re.compile(r'^\s*sitemap\s*:\s*(\S+)', re.IGNORECASE | re.MULTILINE)
+
+def parse_lastmod(value):
+    """Convert a sitemap <lastmod> value to a UTC timestamp (0 if missing)"""
+    if not value:
+        return 0.0
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    except ValueError:
+        return 0.0
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+class _PrefixedReader:
+    """File-like reader that replays already-consumed bytes before the stream"""
+
+    def __init__(self, prefix, stream):
+        self.prefix = prefix
+        self.stream = stream
+
+    def read(self, size=-1):
+        prefix, self.prefix = self.prefix, b''
+        if size is None or size < 0:
+            return prefix + self.stream.read()
+        if len(prefix) >= size:
+            self.prefix = prefix[size:]
+            return prefix[:size]
+        return prefix + self.stream.read(size - len(prefix))
+
+class SitemapReader:
+    def __init__(self, client, max_sitemaps=1000):
+        self.client = client
+        self.max_sitemaps = max_sitemaps
+
+    def discover(self, base_url, robots_sitemaps=None):
+        """Find sitemap URLs from robots.txt, falling back to /sitemap.xml
+
+        Pass the Sitemap: URLs from an already parsed robots.txt to avoid
+        fetching it again.
+        """
+        parsed = urllib.parse.urlparse(base_url)
+        root = f"{parsed.scheme}://{parsed.netloc}"
+
+        sitemaps = robots_sitemaps
+        if sitemaps is None:
+            sitemaps = []
+            try:
+                response = self.client.get(f"{root}/robots.txt")
+                if response.status_code == 200:
+                    sitemaps = SITEMAP_LINE.findall(response.text)
+            except Exception as e:
+                logger.warning(f"Error reading robots.txt for {root}: {e}")
+
+        return sitemaps or [f"{root}/sitemap.xml"]
+
+    def _open(self, response):
+        """Return a file object over the (possibly gzipped) sitemap body"""
+        response.raw.decode_content = True
+        stream = _PrefixedReader(response.raw.read(2), response.raw)
+
+        # .xml.gz files are usually served without Content-Encoding
+        if stream.prefix == b'\x1f\x8b':
+            return gzip.GzipFile(fileobj=stream)
+        return stream
+
+    def iter_entries(self, sitemap_url):
+        """Stream (kind, loc, lastmod) entries from a single sitemap file"""
+        response = self.client.get(sitemap_url, stream=True)
+        try:
+            if response.status_code != 200:
+                logger.warning(f"Failed to fetch sitemap {sitemap_url}: HTTP {response.status_code}")
+                return
+
+            root = None
+            loc = lastmod = None
+            for event, elem in ET.iterparse(self._open(response), events=('start', 'end')):
+                if root is None:
+                    root = elem
+                if event != 'end':
+                    continue
+
+                tag = elem.tag.rsplit('}', 1)[-1]
+                if tag == 'loc':
+                    loc = (elem.text or '').strip()
+                elif tag == 'lastmod':
+                    lastmod = (elem.text or '').strip()
+                elif tag in ('url', 'sitemap'):
+                    if loc:
+                        yield tag, loc, lastmod
+
+                    # Drop finished entries so memory stays flat
+                    loc = lastmod = None
+                    root.clear()
+        except ET.ParseError as e:
+            logger.warning(f"Error parsing sitemap {sitemap_url}: {e}")
+        finally:
+            response.close()
+
+    def iter_urls(self, sitemap_urls):
+        """Stream (url, lastmod) pairs, following sitemap indexes"""
+        pending = list(sitemap_urls)
+        seen = set()
+
+        while pending and len(seen) < self.max_sitemaps:
+            sitemap_url = pending.pop()
+            if sitemap_url in seen:
+                continue
+            seen.add(sitemap_url)
+
+            try:
+                for kind, loc, lastmod in self.iter_entries(sitemap_url):
+                    if kind == 'sitemap':
+                        pending.append(loc)
+                    else:
+                        yield loc, lastmod
+            except Exception as e:
+                logger.warning(f"Error reading sitemap {sitemap_url}: {e}")
+
+    def newest_urls(self, sitemap_urls, limit, accept=None):
+        """Get up to limit (url, lastmod timestamp) pairs, most recently modified first"""
+        heap = []
+        seen = set()
+        for loc, lastmod in self.iter_urls(sitemap_urls):
+            url = accept(loc) if accept else loc
+            if not url or url in seen:
+                continue
+
+            entry = (parse_lastmod(lastmod), url)
+            if len(heap) < limit:
+                heapq.heappush(heap, entry)
+                seen.add(url)
+            elif entry > heap[0]:
+                seen.discard(heapq.heapreplace(heap, entry)[1])
+                seen.add(url)
+
+        return [(url, lastmod) for lastmod, url in sorted(heap, reverse=True)]
@@ -4,6 +4,8 @@ import re
 from collections import defaultdict
 import logging
 
+from utils.link_graph import link_counts
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -250,7 +252,7 @@ class SuggestionEngine:
         stats = {
             'pages_indexed': len(self.pages_df),
             'orphaned_pages': len(self.orphaned_pages) if self.orphaned_pages is not None else 0,
-            'internal_links': len(self.links_df),
+            'internal_links': int(link_counts(self.links_df).sum()),
             'topic_clusters': len(self.topic_clusters) if self.topic_clusters is not None else 0
         }
         
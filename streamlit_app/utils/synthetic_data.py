@@ -0,0 +1,202 @@
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SECTIONS = np.array(['blog', 'products', 'services', 'guides', 'news', 'support'], dtype=object)
+TOPIC_WORDS = np.array([
+    'seo', 'content', 'marketing', 'strategy', 'analysis', 'internal', 'linking', 'optimization',
+    'search', 'ranking', 'keyword', 'traffic', 'audit', 'crawl', 'index', 'anchor', 'cluster',
+    'authority', 'structure', 'navigation', 'conversion', 'engagement', 'backlinks', 'schema',
+    'mobile', 'speed', 'local', 'ecommerce', 'analytics', 'email', 'social', 'video', 'brand',
+    'design', 'copywriting', 'research', 'outreach', 'reporting', 'technical', 'migration'
+], dtype=object)
+FILLER_WORDS = np.array(['the', 'and', 'for', 'with', 'your', 'how', 'to', 'of', 'in', 'a',
+                         'is', 'that', 'on', 'best', 'guide', 'tips', 'why', 'what', 'new', 'more'], dtype=object)
+ANCHOR_TEXTS = np.array(['Read more', 'Learn more', 'Click here', 'See the guide', 'Related article',
+                         'Full details', 'Our services', 'View products', 'Home', 'Next page'], dtype=object)
+
+def power_law_ranks(rng, sizes, alpha=1.2):
+    """Draw a 0-based rank below each size, with P(rank = r) roughly proportional to (r + 1) ** -alpha
+
+    Inverse-transform sampling of a bounded Pareto distribution, so any
+    number of draws with different bounds is one vectorized call.
+    """
+    sizes = np.asarray(sizes, dtype=np.float64)
+    u = rng.random(sizes.shape)
+    if abs(alpha - 1.0) < 1e-9:
+        x = (sizes + 1) ** u
+    else:
+        power = 1.0 - alpha
+        x = (((sizes + 1) ** power - 1) * u + 1) ** (1.0 / power)
+    return np.minimum(x.astype(np.int64) - 1, sizes.astype(np.int64) - 1)
+
+def _join_words(columns):
+    """Join equal-length object arrays of words with spaces, element-wise"""
+    text = columns[0]
+    for column in columns[1:]:
+        text = text + ' ' + column
+    return text
+
+def generate_site_data(num_pages, domain='example.com', avg_links=20, num_topics=20, topic_affinity=0.8,
+                       power_law=1.2, content_sentences=5, max_depth=3, seed=0, crawled_at=None):
+    """Generate a synthetic crawl as (pages_df, links_df) without building any page dicts
+
+    Everything is drawn with NumPy from one seeded generator, so the same
+    arguments always give the same data. Pages are split into topics of
+    power-law sizes. Each page has about avg_links outgoing links; with
+    probability topic_affinity a link stays inside the page's topic, and
+    link targets follow a power law so in-degree is heavy-tailed (the home
+    page and each topic's hub collect most links). Content is drawn from
+    the topic's own words so analysis finds the topics again.
+
+    URL and anchor columns in links_df are categoricals over the page
+    URLs, which keeps 20M links at a few hundred MB.
+    """
+    if num_pages < 2:
+        raise ValueError("num_pages must be at least 2")
+
+    rng = np.random.default_rng(seed)
+    num_topics = max(1, min(num_topics, num_pages - 1))
+    page_ids = np.arange(num_pages)
+
+    # Topic sizes follow a power law (at least one page each); topics own
+    # contiguous id ranges after the home page
+    spare = num_pages - 1 - num_topics
+    topic_weights = 1.0 / np.arange(1, num_topics + 1) ** power_law
+    topic_sizes = 1 + np.floor(topic_weights / topic_weights.sum() * spare).astype(np.int64)
+    topic_sizes[0] += num_pages - 1 - topic_sizes.sum()
+    topic_starts = 1 + np.concatenate(([0], np.cumsum(topic_sizes)[:-1]))
+    topics = np.zeros(num_pages, dtype=np.int32)
+    topics[1:] = np.repeat(np.arange(num_topics, dtype=np.int32), topic_sizes)
+
+    # Hubs sit at the start of each topic, so depth grows with the rank inside the topic
+    rank_in_topic = page_ids - topic_starts[topics]
+    depths = np.minimum(max_depth, 1 + np.floor(np.log10(np.maximum(rank_in_topic, 0) + 1)).astype(np.int64))
+    depths[0] = 0
+
+    # URLs and text
+    sections = SECTIONS[topics % len(SECTIONS)]
+    urls = (f"https://{domain}/" + sections + '/page-' + page_ids.astype(str).astype(object) + '/')
+    urls[0] = f"https://{domain}/"
+
+    words_per_topic = 8
+    topic_vocab = rng.integers(0, len(TOPIC_WORDS), size=(num_topics, words_per_topic))
+    title_words = TOPIC_WORDS[topic_vocab[topics[:, None], rng.integers(0, words_per_topic, size=(num_pages, 3))]]
+    titles = _join_words([title_words[:, i] for i in range(3)]) + ' - ' + domain
+    titles[0] = f"Home - {domain}"
+
+    # Content is built from a small pool of sentences per topic, mixing the
+    # topic's words with filler; joining whole sentences keeps this fast
+    sentences_per_topic = 32
+    sentence_length = 12
+    topic_choice = rng.random((num_topics, sentences_per_topic, sentence_length)) < 0.4
+    topic_part = TOPIC_WORDS[np.take_along_axis(
+        topic_vocab[:, None, :].repeat(sentences_per_topic, axis=1),
+        rng.integers(0, words_per_topic, size=(num_topics, sentences_per_topic, sentence_length)),
+        axis=2
+    )]
+    filler_part = FILLER_WORDS[rng.integers(0, len(FILLER_WORDS), size=(num_topics, sentences_per_topic, sentence_length))]
+    sentence_words = np.where(topic_choice, topic_part, filler_part).reshape(-1, sentence_length)
+    sentences = _join_words([sentence_words[:, i] for i in range(sentence_length)]) + '.'
+    picks = topics[:, None] * sentences_per_topic + rng.integers(0, sentences_per_topic, size=(num_pages, content_sentences))
+    contents = _join_words([sentences[picks[:, i]] for i in range(content_sentences)])
+
+    # Links: out-degree per page, then targets either inside the topic or site-wide
+    out_degree = rng.poisson(avg_links, size=num_pages).astype(np.int64)
+    sources = np.repeat(page_ids, out_degree)
+    source_topics = topics[sources]
+
+    in_topic = rng.random(len(sources)) < topic_affinity
+    targets = np.empty(len(sources), dtype=np.int64)
+
+    topic_targets = topic_starts[source_topics[in_topic]] + power_law_ranks(
+        rng, topic_sizes[source_topics[in_topic]], power_law)
+    targets[in_topic] = topic_targets
+
+    # Site-wide popularity: the home page first, then the other pages in a fixed shuffled order
+    popularity_order = np.concatenate(([0], 1 + rng.permutation(num_pages - 1)))
+    targets[~in_topic] = popularity_order[power_law_ranks(rng, np.full((~in_topic).sum(), num_pages), power_law)]
+
+    # Pages don't link to themselves
+    self_links = targets == sources
+    targets[self_links] = (targets[self_links] + 1) % num_pages
+    out_degree = np.bincount(sources, minlength=num_pages)
+
+    url_categories = pd.Index(urls)
+    links_df = pd.DataFrame({
+        'source_url': pd.Categorical.from_codes(sources.astype(np.int32), categories=url_categories),
+        'target_url': pd.Categorical.from_codes(targets.astype(np.int32), categories=url_categories),
+        'anchor_text': pd.Categorical.from_codes(
+            rng.integers(0, len(ANCHOR_TEXTS), size=len(sources)).astype(np.int8),
+            categories=pd.Index(ANCHOR_TEXTS)
+        )
+    })
+
+    pages_df = pd.DataFrame({
+        'url': urls,
+        'title': titles,
+        'description': 'This is a description for ' + urls,
+        'h1': titles,
+        'depth': depths,
+        'outgoing_links': out_degree,
+        'crawled_at': crawled_at or datetime.now().isoformat(),
+        'topic': topics,
+        'content': contents
+    })
+
+    logger.info(f"Generated {num_pages} synthetic pages and {len(links_df)} links")
+    return pages_df, links_df
+
+def _pair_hash(rows, cols, seed):
+    """Uniform floats in [0, 1) from a splitmix64 hash of each unordered (row, col) pair"""
+    low = np.minimum(rows, cols).astype(np.uint64)
+    high = np.maximum(rows, cols).astype(np.uint64)
+    x = low * np.uint64(0x9E3779B97F4A7C15) ^ high * np.uint64(0xC2B2AE3D27D4EB4F) ^ seed
+    x ^= x >> np.uint64(30)
+    x *= np.uint64(0xBF58476D1CE4E5B9)
+    x ^= x >> np.uint64(27)
+    x *= np.uint64(0x94D049BB133111EB)
+    x ^= x >> np.uint64(31)
+    return (x >> np.uint64(40)).astype(np.float32) / np.float32(1 << 24)
+
+class SimulatedSimilarity:
+    """Simulated page similarities, computed on demand instead of stored
+
+    Indexes like the N x N matrix from ContentAnalyzer.analyze_pages (a row,
+    one entry, or a block of slices) but only keeps the page topics, so
+    simulating a million pages needs no N x N memory. Values are a hash of
+    the page pair, so they are repeatable and symmetric: between 0.1 and
+    0.9, higher within a topic, and 1 on the diagonal.
+    """
+
+    def __init__(self, num_pages, topics=None, seed=None):
+        self.shape = (num_pages, num_pages)
+        self.topics = None if topics is None else np.asarray(topics)
+        if seed is None:
+            seed = np.random.default_rng().integers(2 ** 63)
+        self.seed = np.uint64(seed)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, key):
+        rows, cols = key if isinstance(key, tuple) else (key, slice(None))
+        indices = np.arange(self.shape[0])
+        rows, cols = indices[rows], indices[cols]
+
+        row_grid = np.reshape(rows, (-1, 1))
+        col_grid = np.reshape(cols, (1, -1))
+        values = _pair_hash(row_grid, col_grid, self.seed) * np.float32(0.4)
+        if self.topics is not None:
+            same_topic = self.topics[row_grid] == self.topics[col_grid]
+            values += np.where(same_topic, np.float32(0.5), np.float32(0.1))
+        else:
+            values *= 2
+            values += np.float32(0.1)
+        values[row_grid == col_grid] = 1.0
+        return values.reshape(np.shape(rows) + np.shape(cols))[()]
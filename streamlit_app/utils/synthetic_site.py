@@ -0,0 +1,220 @@
+import http.server
+import multiprocessing
+import random
+import sys
+import threading
+import time
+import numpy as np
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SECTIONS = ['blog', 'products', 'services', 'guides', 'news', 'support']
+WORDS = ['seo', 'content', 'marketing', 'strategy', 'analysis', 'internal', 'linking', 'optimization',
+         'search', 'ranking', 'keyword', 'traffic', 'page', 'site', 'audit', 'crawl', 'index', 'anchor',
+         'topic', 'cluster', 'authority', 'structure', 'navigation', 'conversion', 'engagement', 'guide',
+         'the', 'and', 'for', 'with', 'your', 'how', 'to', 'of', 'in', 'a', 'is', 'that', 'on', 'best']
+
+class SyntheticSite:
+    """A deterministic fake website of num_pages pages
+
+    Pages form a tree (each page links to its `branching` children, so
+    every page is reachable within log(num_pages) clicks) plus about
+    avg_links extra links whose targets follow a power law: a few pages
+    collect most of the links, like real home, category and hub pages.
+    Pages are rendered on request, padded to roughly html_size bytes.
+    """
+
+    def __init__(self, num_pages, avg_links=20, branching=10, html_size=30000, power_law=1.2, seed=0):
+        self.num_pages = num_pages
+        self.avg_links = avg_links
+        self.branching = branching
+        self.html_size = html_size
+        self.seed = seed
+
+        # In-link popularity falls off with page rank
+        weights = 1.0 / np.arange(1, num_pages + 1) ** power_law
+        self.popularity = np.cumsum(weights / weights.sum())
+
+        # A shared pool of paragraphs keeps rendering cheap
+        rng = random.Random(seed)
+        self.paragraphs = [
+            ' '.join(rng.choice(WORDS) for _ in range(rng.randint(40, 120))).capitalize() + '.'
+            for _ in range(256)
+        ]
+
+    def path(self, index):
+        if index == 0:
+            return '/'
+        return f"/{SECTIONS[index % len(SECTIONS)]}/page-{index}/"
+
+    def page_index(self, path):
+        """Get the page number for a URL path, or None if there is no such page"""
+        if path == '/':
+            return 0
+        try:
+            index = int(path.rstrip('/').rsplit('-', 1)[1])
+        except (IndexError, ValueError):
+            return None
+        return index if 0 < index < self.num_pages and path == self.path(index) else None
+
+    def links(self, index):
+        """Get the page numbers a page links to"""
+        first_child = index * self.branching + 1
+        children = range(first_child, min(first_child + self.branching, self.num_pages))
+
+        rng = np.random.default_rng((self.seed, index))
+        count = rng.poisson(self.avg_links)
+        targets = np.searchsorted(self.popularity, rng.random(count))
+        targets = np.minimum(targets, self.num_pages - 1)
+        return list(children) + targets.tolist()
+
+    def render(self, index):
+        """Render a page's HTML"""
+        rng = random.Random(self.seed * 1000003 + index)
+        title = ' '.join(rng.choice(WORDS[:26]) for _ in range(4)).title()
+
+        nav = ''.join(f'<li><a href="{self.path(number)}">{SECTIONS[number % len(SECTIONS)].title()}</a></li>'
+                      for number in range(1, min(len(SECTIONS) + 1, self.num_pages)))
+        links = [f'<a href="{self.path(target)}">{rng.choice(WORDS[:26])} {rng.choice(WORDS[:26])}</a>'
+                 for target in self.links(index)]
+
+        # Spread the links through paragraphs until the page is big enough
+        body = []
+        size = 0
+        while size < self.html_size or links:
+            paragraph = rng.choice(self.paragraphs)
+            if links:
+                paragraph = f"{paragraph} {links.pop()}"
+            heading = f"<h2>{rng.choice(WORDS[:26]).title()}</h2>" if len(body) % 5 == 0 else ''
+            body.append(f"{heading}<p>{paragraph}</p>")
+            size += len(body[-1])
+
+        return (
+            f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>{title}</title>"
+            f"<meta name=\"description\" content=\"{title} - page {index}\">"
+            f"<link rel=\"canonical\" href=\"{self.path(index)}\">"
+            f"<style>body{{font-family:sans-serif}}</style></head><body>"
+            f"<header><nav><ul>{nav}</ul></nav></header>"
+            f"<main><h1>{title}</h1>{''.join(body)}</main>"
+            f"<footer><p>Synthetic site</p></footer><script>var page = {index};</script></body></html>"
+        ).encode('utf-8')
+
+def make_handler(site, latency=0.0, jitter=0.0, error_rate=0.0, seed=0):
+    """Build a request handler serving the site with injected latency and errors"""
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    class SyntheticSiteHandler(http.server.BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def send_body(self, status, body, content_type='text/html; charset=utf-8', etag=None):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            if etag:
+                self.send_header('ETag', etag)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            with lock:
+                delay = latency + rng.uniform(0, jitter) if latency or jitter else 0
+                failed = error_rate and rng.random() < error_rate
+            if delay:
+                time.sleep(delay)
+
+            if self.path == '/robots.txt':
+                self.send_body(200, b"User-agent: *\nAllow: /\n", 'text/plain')
+            elif failed:
+                self.send_body(503, b"Service Unavailable", 'text/plain')
+            else:
+                index = site.page_index(self.path.split('?', 1)[0])
+                # Pages never change, so a matching ETag always gets a 304
+                etag = f'"{site.seed}-{index}"'
+                if index is None:
+                    self.send_body(404, b"Not Found", 'text/plain')
+                elif self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                else:
+                    self.send_body(200, site.render(index), etag=etag)
+
+    return SyntheticSiteHandler
+
+class QuietHTTPServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Crawlers drop keep-alive connections whenever they are done
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+def _serve(site_options, server_options, port_queue):
+    site = SyntheticSite(**site_options)
+    server = QuietHTTPServer(('127.0.0.1', 0), make_handler(site, **server_options))
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+class SyntheticSiteServer:
+    """Serve a SyntheticSite on localhost
+
+    By default the server runs in its own process, so rendering pages
+    does not compete with the crawler being measured for the GIL.
+
+        with SyntheticSiteServer(num_pages=1000, latency=0.01) as server:
+            WebCrawler().crawl(server.url)
+    """
+
+    def __init__(self, num_pages, latency=0.0, jitter=0.0, error_rate=0.0, separate_process=True, **site_options):
+        self.site_options = dict(site_options, num_pages=num_pages)
+        self.server_options = {'latency': latency, 'jitter': jitter, 'error_rate': error_rate,
+                               'seed': site_options.get('seed', 0)}
+        self.separate_process = separate_process
+        self.process = None
+        self.server = None
+        self.port = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}/"
+
+    def start(self):
+        if self.separate_process:
+            port_queue = multiprocessing.Queue()
+            self.process = multiprocessing.Process(
+                target=_serve,
+                args=(self.site_options, self.server_options, port_queue),
+                daemon=True
+            )
+            self.process.start()
+            self.port = port_queue.get(timeout=30)
+        else:
+            site = SyntheticSite(**self.site_options)
+            self.server = QuietHTTPServer(('127.0.0.1', 0), make_handler(site, **self.server_options))
+            self.port = self.server.server_address[1]
+            threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        logger.info(f"Serving {self.site_options['num_pages']} synthetic pages at {self.url}")
+        return self
+
+    def stop(self):
+        if self.process is not None:
+            self.process.terminate()
+            self.process.join()
+            self.process = None
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,150 @@
+import threading
+import time
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    def __init__(self, rate, capacity=1):
+        self.rate = rate  # tokens per second, 0 means unlimited
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def set_rate(self, rate):
+        """Change the refill rate without losing the current balance"""
+        with self.lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+
+    def _refill(self, now):
+        if self.rate > 0:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        else:
+            self.tokens = max(self.tokens, self.capacity)
+        self.updated = now
+
+    def reserve(self):
+        """Take a token and return how many seconds to wait before using it"""
+        with self.lock:
+            self._refill(time.monotonic())
+            self.tokens -= 1
+
+            # A negative balance is a reservation on future refills
+            if self.tokens >= 0 or self.rate <= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+class HostThrottle:
+    def __init__(self, delay=1, burst=1):
+        self.delay = delay
+        self.burst = burst
+        self.buckets = {}
+        self.delays = {}
+        self.min_delays = {}
+        self.lock = threading.Lock()
+
+    def _rate(self, delay):
+        return 1.0 / delay if delay and delay > 0 else 0
+
+    def get_delay(self, host):
+        """Get the delay currently applied to a host"""
+        return self.delays.get(host, self.delay)
+
+    def set_delay(self, host, delay):
+        """Override the delay between requests for a single host"""
+        with self.lock:
+            self.delays[host] = delay
+            bucket = self.buckets.get(host)
+        if bucket:
+            bucket.set_rate(self._rate(delay))
+
+    def set_min_delay(self, host, delay):
+        """Never go below this delay for a host, e.g. its robots.txt Crawl-delay"""
+        with self.lock:
+            self.min_delays[host] = delay
+        if self.get_delay(host) < delay:
+            self.set_delay(host, delay)
+
+    def get_concurrency(self, host, default):
+        """Get the number of parallel requests allowed for a host"""
+        return default
+
+    def record(self, host, latency, ok=True):
+        """Report a finished request; a fixed throttle ignores it"""
+
+    def wait(self, host):
+        """Block until the host's token bucket allows another request"""
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self._rate(self.get_delay(host)), self.burst)
+                self.buckets[host] = bucket
+
+        wait_time = bucket.reserve()
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return wait_time
+
+class AutoThrottle(HostThrottle):
+    """Per-host delay and concurrency adapted to the server's latency and errors
+
+    Concurrency grows by about one per window of fast, successful requests
+    and halves on errors (AIMD). The delay follows latency / concurrency,
+    smoothed, so a healthy host ends up with max_concurrency requests in
+    flight back to back, and doubles on errors. Everything stays within
+    the min/max bounds and above any per-host minimum delay.
+    """
+
+    def __init__(self, delay=1, min_delay=0, max_delay=60, min_concurrency=1,
+                 max_concurrency=8, smoothing=0.3, burst=1):
+        super().__init__(delay, burst)
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max(min_concurrency, max_concurrency)
+        self.smoothing = smoothing
+        self.latencies = {}
+        self.concurrency = {}
+
+    def _clamp(self, host, delay):
+        low = max(self.min_delay, self.min_delays.get(host, 0))
+        return min(max(delay, low), max(self.max_delay, low))
+
+    def get_concurrency(self, host, default=None):
+        """Get the number of parallel requests currently allowed for a host"""
+        return int(self.concurrency.get(host, self.min_concurrency))
+
+    def get_latency(self, host):
+        """Get the smoothed response time seen for a host, if any"""
+        return self.latencies.get(host)
+
+    def record(self, host, latency, ok=True):
+        """Adjust the host's delay and concurrency after a request"""
+        with self.lock:
+            average = self.latencies.get(host)
+            if average is None:
+                average = latency
+            else:
+                average += self.smoothing * (latency - average)
+            self.latencies[host] = average
+
+            delay = self.delays.get(host, self.delay)
+            concurrency = self.concurrency.get(host, self.min_concurrency)
+
+            if ok:
+                # Only open up while the server isn't slowing down
+                if latency <= 1.2 * average:
+                    concurrency = min(self.max_concurrency, concurrency + 1 / concurrency)
+                delay = (delay + average / concurrency) / 2
+            else:
+                concurrency = max(self.min_concurrency, concurrency / 2)
+                delay = max(delay * 2, average)
+
+            self.concurrency[host] = concurrency
+            delay = self._clamp(host, delay)
+
+        self.set_delay(host, delay)
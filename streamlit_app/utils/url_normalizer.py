@@ -0,0 +1,89 @@
+import posixpath
+import urllib.parse
+
+# Query parameters that only carry tracking data; '*' matches any suffix
+DEFAULT_TRACKING_PARAMS = (
+    'utm_*', 'gclid', 'gclsrc', 'dclid', 'fbclid', 'msclkid', 'yclid', 'twclid',
+    'mc_cid', 'mc_eid', '_ga', '_gl', 'igshid', '_hsenc', '_hsmi', 'mkt_tok', 'ref_src'
+)
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+TRAILING_SLASH_POLICIES = ('keep', 'add', 'remove')
+
+class URLNormalizer:
+    def __init__(self, trailing_slash='keep', sort_query=True, strip_tracking=True,
+                 tracking_params=DEFAULT_TRACKING_PARAMS, drop_fragment=True):
+        if trailing_slash not in TRAILING_SLASH_POLICIES:
+            raise ValueError(f"trailing_slash must be one of {', '.join(TRAILING_SLASH_POLICIES)}")
+
+        self.trailing_slash = trailing_slash
+        self.sort_query = sort_query
+        self.strip_tracking = strip_tracking
+        self.drop_fragment = drop_fragment
+
+        # Split the blocklist into exact names and prefixes for fast lookups
+        params = [param.lower() for param in tracking_params]
+        self.tracking_exact = {param for param in params if not param.endswith('*')}
+        self.tracking_prefixes = tuple(param[:-1] for param in params if param.endswith('*'))
+
+    def is_tracking_param(self, name):
+        """Check if a query parameter is on the tracking blocklist"""
+        name = name.lower()
+        return name in self.tracking_exact or (bool(self.tracking_prefixes) and name.startswith(self.tracking_prefixes))
+
+    def normalize_netloc(self, scheme, netloc):
+        """Lowercase the host and drop the scheme's default port"""
+        userinfo, _, hostport = netloc.rpartition('@')
+        host, port = hostport.lower(), None
+
+        # Leave IPv6 literals like [::1]:8080 intact apart from the port
+        if host.rfind(':') > host.rfind(']'):
+            host, port = host.rsplit(':', 1)
+        host = host.rstrip('.')
+
+        if port and (not port.isdigit() or int(port) == DEFAULT_PORTS.get(scheme)):
+            port = None
+        if port:
+            host = f"{host}:{port}"
+        return f"{userinfo}@{host}" if userinfo else host
+
+    def normalize_path(self, path):
+        """Apply the trailing-slash policy to the path"""
+        if not path:
+            return '/'
+        if path == '/' or self.trailing_slash == 'keep':
+            return path
+
+        if self.trailing_slash == 'remove':
+            return path.rstrip('/') or '/'
+
+        # Only add a slash to directory-like paths, not to /page.html
+        if not path.endswith('/') and not posixpath.splitext(path)[1]:
+            return path + '/'
+        return path
+
+    def normalize_query(self, query):
+        """Drop tracking parameters and sort the rest"""
+        if not query or not (self.sort_query or self.strip_tracking):
+            return query
+
+        params = urllib.parse.parse_qsl(query, keep_blank_values=True)
+        if self.strip_tracking:
+            params = [(name, value) for name, value in params if not self.is_tracking_param(name)]
+        if self.sort_query:
+            params.sort(key=lambda param: param[0])
+        return urllib.parse.urlencode(params)
+
+    def normalize(self, url):
+        """Normalize an absolute URL so equivalent URLs compare equal"""
+        parsed = urllib.parse.urlsplit(url.strip())
+        scheme = parsed.scheme.lower()
+
+        return urllib.parse.urlunsplit((
+            scheme,
+            self.normalize_netloc(scheme, parsed.netloc),
+            self.normalize_path(parsed.path),
+            self.normalize_query(parsed.query),
+            '' if self.drop_fragment else parsed.fragment
+        ))